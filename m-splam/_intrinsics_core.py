@@ -0,0 +1,144 @@
+"""
+_intrinsics_core.py
+
+Shared helpers for reading, scaling and writing camera intrinsics, used by
+shuttle_intrinsics.py (and its scratch variant):
+- read COLMAP cameras.txt
+- scale intrinsics to MASt3R-SLAM keyframe resolution (resize + center crop)
+- write intrinsics.yaml for MASt3R-SLAM
+- write cameras.txt / cameras.bin for splatting
+
+mast3r_slam (and therefore torch) is only imported when intrinsics are
+actually scaled, so the readers/writers stay cheap to import.
+"""
+import struct
+from pathlib import Path
+
+import numpy as np
+
+# COLMAP camera model name to ID mapping
+MODEL_NAME_TO_ID = {
+    'SIMPLE_PINHOLE': 0,
+    'PINHOLE': 1,
+    'SIMPLE_RADIAL': 2,
+    'RADIAL': 3,
+    'OPENCV': 4,
+    'OPENCV_FISHEYE': 5,
+    'FULL_OPENCV': 6,
+    'FOV': 7,
+    'SIMPLE_RADIAL_FISHEYE': 8,
+    'RADIAL_FISHEYE': 9,
+    'THIN_PRISM_FISHEYE': 10
+}
+
+# cameras.bin header: num_cameras, camera_id, model_id, width, height
+CAMERAS_BIN_HEADER = struct.Struct('<QiiQQ')
+
+
+def read_colmap_cameras_txt(cameras_txt_path):
+    """Read the first camera from COLMAP cameras.txt (params as a float64 array)."""
+    with open(cameras_txt_path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            # Format: CAMERA_ID MODEL WIDTH HEIGHT PARAMS[]
+            parts = line.split()
+            return {
+                'camera_id': int(parts[0]),
+                'model': parts[1],
+                'width': int(parts[2]),
+                'height': int(parts[3]),
+                'params': np.asarray(parts[4:], dtype=np.float64)
+            }
+    raise ValueError(f"No camera found in {cameras_txt_path}")
+
+
+def params_to_matrix(params):
+    """Build the 3x3 intrinsic matrix K from (fx, fy, cx, cy, ...) params."""
+    fx, fy, cx, cy = params[:4]
+    return np.array([[fx, 0, cx], [0, fy, cy], [0, 0, 1]], dtype=np.float64)
+
+
+def scale_intrinsics_crop_aware(K, raw_w, raw_h, target_size):
+    """
+    Scale intrinsics from raw resolution to MASt3R-SLAM keyframe resolution,
+    using resize_img's own resize + center-crop transformation.
+
+    Returns:
+        K_scaled: Adjusted 3x3 intrinsic matrix
+        out_w, out_h: Keyframe dimensions after resize and crop
+    """
+    from mast3r_slam.dataloader import resize_img
+
+    # Only the transformation is needed, so probe with a cheap uint8 dummy image
+    _, (scale_w, scale_h, half_crop_w, half_crop_h) = resize_img(
+        np.zeros((raw_h, raw_w, 3), dtype=np.uint8), target_size, return_transformation=True
+    )
+    S = np.array([
+        [1 / scale_w, 0, -half_crop_w],
+        [0, 1 / scale_h, -half_crop_h],
+        [0, 0, 1]
+    ])
+    K_scaled = S @ K
+    out_w = int(round(raw_w / scale_w - 2 * half_crop_w))
+    out_h = int(round(raw_h / scale_h - 2 * half_crop_h))
+    return K_scaled, out_w, out_h
+
+
+def write_mast3r_yaml(output_path, width, height, K, distortion_params):
+    """Write intrinsics.yaml for MASt3R-SLAM (distortion only if non-negligible)."""
+    calibration = [float(K[0, 0]), float(K[1, 1]), float(K[0, 2]), float(K[1, 2])]
+    has_distortion = any(abs(d) > 1e-6 for d in distortion_params)
+    if has_distortion:
+        calibration.extend([float(d) for d in distortion_params])
+
+    # Written by hand (no yaml.dump) with comments; repr keeps full float precision
+    calib_str = '[' + ', '.join(f'{x!r}' for x in calibration) + ']'
+    with open(output_path, 'w') as f:
+        f.write(''.join([
+            f"width: {int(width)}\n",
+            f"height: {int(height)}\n",
+            "# With distortion (fx, fy, cx, cy, k1, k2, p1, p2)\n" if has_distortion
+            else "# Without distortion (fx, fy, cx, cy)\n",
+            f"calibration: {calib_str}\n",
+        ]))
+    print(f"✓ Saved MASt3R-SLAM intrinsics: {output_path}")
+
+
+def write_colmap_cameras_txt(output_path, camera_id, model, width, height, params):
+    """Write a single-camera COLMAP cameras.txt."""
+    # float() first so numpy scalars also repr as plain, full-precision floats
+    params_str = ' '.join(repr(float(p)) for p in params)
+    Path(output_path).write_text(
+        "# Camera list with one line of data per camera:\n"
+        "#   CAMERA_ID, MODEL, WIDTH, HEIGHT, PARAMS[]\n"
+        "# Number of cameras: 1\n"
+        f"{camera_id} {model} {width} {height} {params_str}\n"
+    )
+    print(f"✓ Saved COLMAP cameras.txt: {output_path}")
+
+
+def write_colmap_cameras_bin(output_path, camera_id, model, width, height, params):
+    """
+    Write a single-camera COLMAP cameras.bin.
+
+    Binary format:
+        num_cameras (uint64)
+        For each camera:
+            camera_id (int32)
+            model_id (int32)
+            width (uint64)
+            height (uint64)
+            params (double[], no num_params field - model_id determines count)
+    """
+    try:
+        model_id = MODEL_NAME_TO_ID[model]
+    except KeyError:
+        raise ValueError(f"Unknown camera model: {model}") from None
+
+    # Header in one pack, params appended as a raw double blob
+    buf = CAMERAS_BIN_HEADER.pack(1, camera_id, model_id, width, height) + np.asarray(params, dtype='<f8').tobytes()
+    with open(output_path, 'wb') as f:
+        f.write(buf)
+    print(f"✓ Saved COLMAP cameras.bin: {output_path}")
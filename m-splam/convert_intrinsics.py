@@ -4,25 +4,54 @@
 
 
 import os
-import glob
 import struct
 import argparse
 from PIL import Image
 from pathlib import Path
 
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# JPEG start-of-frame markers (SOF0-SOF15, excluding DHT, JPG and DAC)
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7,
+                    0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+def read_image_size(path):
+    """
+    Return (width, height) by parsing the PNG IHDR chunk or JPEG SOF marker
+    directly, without creating a PIL image. Falls back to PIL for other formats.
+    """
+    with open(path, 'rb') as f:
+        head = f.read(24)
+        if head.startswith(PNG_SIGNATURE) and head[12:16] == b'IHDR':
+            return struct.unpack('>II', head[16:24])
+        if head.startswith(b'\xff\xd8'):
+            f.seek(2)
+            while True:
+                marker = f.read(2)
+                if len(marker) < 2 or marker[0] != 0xFF:
+                    break
+                if marker[1] == 0xFF:  # fill byte, re-sync on the next one
+                    f.seek(-1, os.SEEK_CUR)
+                    continue
+                segment_len = struct.unpack('>H', f.read(2))[0]
+                if marker[1] in JPEG_SOF_MARKERS:
+                    height, width = struct.unpack('>xHH', f.read(5))
+                    return width, height
+                f.seek(segment_len - 2, os.SEEK_CUR)
+    
+    with Image.open(path) as img:
+        return img.size
+
 def get_resolution(directory):
     """Finds the first image in a directory and returns (width, height)."""
-    # Search for common extensions
-    types = ['*.jpg', '*.png', '*.jpeg', '*.JPG', '*.PNG']
-    files = []
-    for t in types:
-        files.extend(glob.glob(os.path.join(directory, t)))
-    
-    if not files:
-        raise FileNotFoundError(f"No images found in {directory}")
+    # Single directory pass, stopping at the first image with a common extension
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                return read_image_size(entry.path) # returns (width, height)
     
-    with Image.open(files[0]) as img:
-        return img.size # returns (width, height)
+    raise FileNotFoundError(f"No images found in {directory}")
 
 def read_cameras_binary(path):
     """Read COLMAP cameras.bin file and return list of camera dicts."""
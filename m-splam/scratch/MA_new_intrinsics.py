@@ -1,6 +1,7 @@
 import os
 import struct
 import shutil
+import numpy as np
 
 # ===============================================================================
 # CONFIGURATION
@@ -24,6 +25,12 @@ CAMERA_MODELS = {
     "SIMPLE_RADIAL_FISHEYE": 8, "RADIAL_FISHEYE": 9, "THIN_PRISM_FISHEYE": 10
 }
 
+# images.bin record prefix: image_id, qvec (4d), tvec (3d), camera_id
+IMAGE_PREFIX_SIZE = struct.calcsize("<IdddddddI")
+IMAGE_COUNT = struct.Struct("<Q")
+NUM_POINTS2D = struct.Struct("<Q")
+CAMERA_ID = struct.Struct("<I")
+
 def read_next_bytes(fid, num_bytes, format_char_sequence):
     """Helper to read and unpack bytes."""
     data = fid.read(num_bytes)
@@ -98,50 +105,42 @@ def main():
             fid.write(struct.pack("<d", param))
 
     # 5. Patch images.bin
-    # We need to read the existing bin, change the camera_id field, and write to a buffer
+    # Every record starts with a fixed 64-byte prefix (image_id, qvec, tvec,
+    # camera_id), so only the 4-byte camera_id at offset 60 needs rewriting.
+    # First pass finds every camera_id offset; second pass overwrites them all
+    # in one vectorized scatter on a copy of the file.
     print(f"Patching {images_bin_path} to point all images to Camera ID {target_cam_id}...")
     
     # We will write to a temporary file first
     temp_images_bin = images_bin_path + ".temp"
     
-    with open(images_bin_path, "rb") as fin, open(temp_images_bin, "wb") as fout:
-        # Read/Write Header (Number of images)
-        num_reg_images = struct.unpack("<Q", fin.read(8))[0]
-        fout.write(struct.pack("<Q", num_reg_images))
-        
-        print(f"Processing {num_reg_images} images...")
+    with open(images_bin_path, "rb") as fin:
+        data = fin.read()
+    
+    num_reg_images = IMAGE_COUNT.unpack_from(data, 0)[0]
+    pos = IMAGE_COUNT.size
+    
+    print(f"Processing {num_reg_images} images...")
+    
+    cam_id_offsets = []
+    for _ in range(num_reg_images):
+        cam_id_offsets.append(pos + IMAGE_PREFIX_SIZE - CAMERA_ID.size)
         
-        for _ in range(num_reg_images):
-            # --- READ ---
-            binary_image_id = struct.unpack("<I", fin.read(4))[0]
-            qw, qx, qy, qz = struct.unpack("<dddd", fin.read(32))
-            tx, ty, tz = struct.unpack("<ddd", fin.read(24))
-            old_camera_id = struct.unpack("<I", fin.read(4))[0]
-            
-            # Read Name (char by char)
-            name_bytes = b""
-            while True:
-                char = fin.read(1)
-                name_bytes += char
-                if char == b'\x00':
-                    break
-            
-            # Read Points
-            num_points2D = struct.unpack("<Q", fin.read(8))[0]
-            # Each point is (x, y, p3d_id) -> 2 doubles + 1 uint64 = 16 + 8 = 24 bytes
-            points_data = fin.read(num_points2D * 24)
-            
-            # --- WRITE ---
-            fout.write(struct.pack("<I", binary_image_id))
-            fout.write(struct.pack("<dddd", qw, qx, qy, qz))
-            fout.write(struct.pack("<ddd", tx, ty, tz))
-            
-            # ** THE FIX: Write the Target Camera ID instead of the old one **
-            fout.write(struct.pack("<I", target_cam_id))
-            
-            fout.write(name_bytes)
-            fout.write(struct.pack("<Q", num_points2D))
-            fout.write(points_data)
+        # Skip the name (zero-terminated) and points
+        name_end = data.index(b'\x00', pos + IMAGE_PREFIX_SIZE) + 1
+        num_points2D = NUM_POINTS2D.unpack_from(data, name_end)[0]
+        # Each point is (x, y, p3d_id) -> 2 doubles + 1 uint64 = 16 + 8 = 24 bytes
+        pos = name_end + NUM_POINTS2D.size + num_points2D * 24
+    
+    # ** THE FIX: Write the Target Camera ID instead of the old one **
+    out = bytearray(data)
+    out_bytes = np.frombuffer(out, dtype=np.uint8)
+    # One conversion of the collected offsets, then a single vectorised scatter
+    byte_idx = np.array(cam_id_offsets, dtype=np.int64)[:, None] + np.arange(CAMERA_ID.size)
+    out_bytes[byte_idx] = np.frombuffer(CAMERA_ID.pack(target_cam_id), dtype=np.uint8)
+    
+    with open(temp_images_bin, "wb") as fout:
+        fout.write(out)
 
     # Replace original images.bin with the patched one
     os.replace(temp_images_bin, images_bin_path)
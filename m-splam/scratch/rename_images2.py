@@ -29,6 +29,30 @@ def is_right_camera(filename):
     """Check if filename contains 'right' (case insensitive)"""
     return 'right' in filename.lower()
 
+def execute_renames(directory, rename_plan):
+    """
+    Apply (old_path, new_name) renames, skipping names that already exist.
+    Existing names come from a single directory scan instead of a stat per file.
+    Returns the (old_name, new_name) pairs that were renamed.
+    """
+    with os.scandir(directory) as it:
+        existing = {entry.name for entry in it}
+    
+    renamed = []
+    skipped = []
+    for old_path, new_name in rename_plan:
+        if new_name in existing:
+            skipped.append(new_name)
+            continue
+        os.rename(old_path, directory / new_name)
+        existing.discard(old_path.name)
+        existing.add(new_name)
+        renamed.append((old_path.name, new_name))
+    
+    if skipped:
+        print("\n".join(f"Skipped: {name} already exists." for name in skipped))
+    return renamed
+
 def rename_stereo_files(directory, files):
     """Rename stereo camera files with sequential ordering"""
     left_files = [f for f in files if is_left_camera(f.name)]
@@ -78,16 +102,9 @@ def rename_stereo_files(directory, files):
         return
     
     # Execute renames
-    count = 0
-    for old_path, new_name in rename_plan:
-        new_path = directory / new_name
-        if not new_path.exists():
-            os.rename(old_path, new_path)
-            count += 1
-        else:
-            print(f"Skipped: {new_name} already exists.")
+    renamed = execute_renames(directory, rename_plan)
     
-    print(f"\nSuccess! Renamed {count} images in stereo mode.")
+    print(f"\nSuccess! Renamed {len(renamed)} images in stereo mode.")
 
 def rename_single_camera_files(directory, files):
     """Original single camera renaming logic"""
@@ -95,25 +112,17 @@ def rename_single_camera_files(directory, files):
     
     print(f"Found {len(files)} images. Starting rename...\n")
     
-    count = 0
+    rename_plan = []
     for file in files:
-        original_name = file.name
-        num = get_frame_number(original_name)
+        num = get_frame_number(file.name)
         clean_base = re.sub(r'\s*\(\d+\)', '', file.stem).replace(' ', '_')
-        new_name = f"{num:04d}_{clean_base}{file.suffix}"
-        
-        old_path = file
-        new_path = directory / new_name
-        
-        if not new_path.exists():
-            os.rename(old_path, new_path)
-            count += 1
-            if count <= 5:
-                print(f"Renamed: {original_name} -> {new_name}")
-        else:
-            print(f"Skipped: {new_name} already exists.")
+        rename_plan.append((file, f"{num:04d}_{clean_base}{file.suffix}"))
+    
+    renamed = execute_renames(directory, rename_plan)
+    for original_name, new_name in renamed[:5]:
+        print(f"Renamed: {original_name} -> {new_name}")
     
-    print(f"\nSuccess! Renamed {count} images.")
+    print(f"\nSuccess! Renamed {len(renamed)} images.")
     print(f"Files are now strictly ordered (0001, 0002... 0010).")
 
 def main():
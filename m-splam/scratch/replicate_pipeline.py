@@ -1,10 +1,17 @@
 import argparse
+import hashlib
 import cv2
 import numpy as np
 import yaml
 import PIL.Image
 from pathlib import Path
 
+# Use the libyaml-backed loader when PyYAML was built with it
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Undistort maps are cached here, keyed on image size + intrinsics
+MAP_CACHE_DIR = Path.home() / ".cache" / "mslam"
+
 # --- Helper from mast3r_utils.py ---
 def _resize_pil_image(img, long_edge_size):
     S = max(img.size)
@@ -15,9 +22,22 @@ def _resize_pil_image(img, long_edge_size):
     new_size = tuple(int(round(x * long_edge_size / S)) for x in img.size)
     return img.resize(new_size, interp)
 
+# --- Same resize on a numpy array via OpenCV (no PIL round-trip) ---
+# INTER_AREA is the appropriate kernel for large downsampling ratios and is
+# much faster than PIL LANCZOS, but is not bit-identical to M-SLAM's output.
+def _resize_cv2_image(img, long_edge_size):
+    h, w = img.shape[:2]
+    S = max(w, h)
+    if S > long_edge_size:
+        interp = cv2.INTER_AREA
+    else:
+        interp = cv2.INTER_CUBIC
+    new_w, new_h = (int(round(x * long_edge_size / S)) for x in (w, h))
+    return cv2.resize(img, (new_w, new_h), interpolation=interp)
+
 # --- Logic to replicate M-SLAM crop ---
-def mslam_crop_logic(pil_img, size=512):
-    W, H = pil_img.size
+def mslam_crop_logic(img, size=512):
+    H, W = img.shape[:2]
     cx, cy = W // 2, H // 2
     
     # Logic from mast3r_utils.py:resize_img
@@ -26,11 +46,17 @@ def mslam_crop_logic(pil_img, size=512):
     
     # Calculate crop box (left, upper, right, lower)
     box = (cx - halfw, cy - halfh, cx + halfw, cy + halfh)
-    img_cropped = pil_img.crop(box)
+    img_cropped = img[cy - halfh:cy + halfh, cx - halfw:cx + halfw]
     return img_cropped, box
 
 # --- Logic to replicate M-SLAM Undistortion ---
 def get_undistort_map(w, h, calib_data):
+    key = hashlib.sha1(repr((w, h, calib_data['calibration'])).encode()).hexdigest()
+    cache_path = MAP_CACHE_DIR / f"maps_{key}.npz"
+    if cache_path.exists():
+        with np.load(cache_path) as cached:
+            return cached['mapx'], cached['mapy']
+
     fx, fy, cx, cy = calib_data['calibration'][:4]
     distortion = np.array(calib_data['calibration'][4:]) if len(calib_data['calibration']) > 4 else np.zeros(4)
     
@@ -45,6 +71,9 @@ def get_undistort_map(w, h, calib_data):
     mapx, mapy = cv2.initUndistortRectifyMap(
         K, distortion, None, K_opt, (w, h), cv2.CV_32FC1
     )
+
+    MAP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    np.savez(cache_path, mapx=mapx, mapy=mapy)
     return mapx, mapy
 
 def main():
@@ -52,6 +81,10 @@ def main():
     parser.add_argument("--image", required=True, help="Path to 1600x1400 Input Image")
     parser.add_argument("--intrinsics", required=True, help="Path to intrinsics.yaml")
     parser.add_argument("--output_dir", default="verification_output", help="Where to save results")
+    parser.add_argument("--fast_resize", action="store_true",
+                        help="Resize with cv2.INTER_AREA (faster, but not bit-identical to M-SLAM) instead of PIL LANCZOS")
+    parser.add_argument("--save_intermediates", action="store_true",
+                        help="Also write the full-size undistorted image (slow JPEG encode)")
     args = parser.parse_args()
 
     out_dir = Path(args.output_dir)
@@ -67,23 +100,30 @@ def main():
     # 2. Undistort (Critical Step!)
     print("Applying Undistortion (cv2.remap)...")
     with open(args.intrinsics, 'r') as f:
-        calib = yaml.safe_load(f)
+        calib = yaml.load(f, Loader=YAML_LOADER)
     
     mapx, mapy = get_undistort_map(w_raw, h_raw, calib)
     img_undistorted = cv2.remap(img_rgb, mapx, mapy, cv2.INTER_LINEAR)
     
     # Save undistorted intermediate
-    cv2.imwrite(str(out_dir / "step1_undistorted_1600.jpg"), cv2.cvtColor(img_undistorted, cv2.COLOR_RGB2BGR))
+    if args.save_intermediates:
+        cv2.imwrite(str(out_dir / "step1_undistorted_1600.jpg"), cv2.cvtColor(img_undistorted, cv2.COLOR_RGB2BGR))
 
     # 3. Resize & Crop (M-SLAM Logic)
-    pil_img = PIL.Image.fromarray(img_undistorted)
-    pil_resized = _resize_pil_image(pil_img, 512)
-    pil_cropped, crop_box = mslam_crop_logic(pil_resized)
+    if args.fast_resize:
+        img_resized = _resize_cv2_image(img_undistorted, 512)
+    else:
+        img_resized = np.asarray(_resize_pil_image(PIL.Image.fromarray(img_undistorted), 512))
+    img_cropped, crop_box = mslam_crop_logic(img_resized)
     
     # Save Final Keyframe
-    pil_cropped.save(out_dir / "replicated_keyframe.png")
+    PIL.Image.fromarray(img_cropped).save(out_dir / "replicated_keyframe.png")
     print(f"\n[SUCCESS] Replicated Keyframe saved to: {out_dir / 'replicated_keyframe.png'}")
-    print("Compare this image with your actual M-SLAM keyframe. They should be identical.")
+    if args.fast_resize:
+        print("Compare this image with your actual M-SLAM keyframe. They should match closely"
+              " (--fast_resize is not bit-exact; drop it for an identical keyframe).")
+    else:
+        print("Compare this image with your actual M-SLAM keyframe. They should be identical.")
 
     # 4. Calculate High-Res Equivalents
     # This logic assumes your High Res is 5568x4872 and Low Res is 1600x1400
@@ -4,6 +4,7 @@ import numpy as np
 import open3d
 import os
 import torch
+from torch.utils.data import DataLoader, Dataset
 
 #For getting mapanything
 from mapanything.models import MapAnything
@@ -12,29 +13,87 @@ from mapanything.utils.image import load_images
 # TODO: Optional config for better memory efficiency (sacrifice speed to prevent OOM)
 os.environ["PYTORCH_CUDA_ALLOC_CONF"] = "expandable_segments:True" # Set True to enable
 
-# Set device
-device = "cuda" if torch.cuda.is_available() else "cpu"
-print(device)
-
-# Load model
-model = MapAnything.from_pretrained("facebook/map-anything").to(device)
-# NOTE: For Apache 2.0 license model, use "facebook/map-anything-apache"
+# Compile the model for repeated inference (one-time compile cost, so off for one-shot debug runs)
+compile_model = False # Set True to enable
 
 # path to images
 images = "/home/ben/encode/data/troll"  
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+num_workers = 8
+
+
+class ImageFolderDataset(Dataset):
+    """One MapAnything view per image, so decode/resize runs in DataLoader workers.
+
+    NOTE: load_images picks the target resolution from the aspect ratio of the images it is
+    given, so per-image loading assumes all images share one aspect ratio (true for a single survey camera).
+    """
+
+    def __init__(self, folder):
+        self.paths = sorted(
+            entry.path for entry in os.scandir(folder)
+            if entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __getitem__(self, idx):
+        view = load_images([self.paths[idx]])[0]
+        # Match a single load_images(all_paths) call, which numbers views by position
+        view["idx"] = idx
+        view["instance"] = str(idx)
+        return view
+
+
+def keep_view(view):
+    # Skip default collation so non-tensor fields (e.g. true_shape) keep their load_images types
+    return view
+
+
+def main():
+    # Set device
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    print(device)
+
+    # Load model
+    model = MapAnything.from_pretrained("facebook/map-anything").to(device)
+    model = model.to(memory_format=torch.channels_last) # NHWC so bf16 convs hit tensor cores
+    if compile_model and hasattr(torch, "compile"):
+        # Compile forward itself: infer() calls into it, and torch.compile(model) would not wrap infer
+        model.forward = torch.compile(model.forward, mode="reduce-overhead", dynamic=False)
+    # NOTE: For Apache 2.0 license model, use "facebook/map-anything-apache"
+
+    # resize, normalize, convert numpy array to pytorch tensors (prefetched in workers, pinned for async H2D)
+    loader = DataLoader(
+        ImageFolderDataset(images),
+        batch_size=None,
+        collate_fn=keep_view,
+        num_workers=num_workers,
+        pin_memory=(device == "cuda"),
+        prefetch_factor=4 if num_workers > 0 else None,
+    )
+    views = []
+    for view in loader:
+        view["img"] = view["img"].to(device, non_blocking=True, memory_format=torch.channels_last)
+        views.append(view)
+
+    # Inference parameters (inference_mode: no autograd bookkeeping)
+    with torch.inference_mode():
+        predictions = model.infer(
+            views,                            # Input views
+            memory_efficient_inference=False, # TODO use for larger datasets? # Trades off speed for more views (up to 2000 views on 140 GB) 
+            use_amp=True,                     # Use mixed precision inference (recommended)
+            amp_dtype="bf16",                 # bf16 inference (recommended; falls back to fp16 if bf16 not supported)
+            apply_mask=True,                  # Apply masking to dense geometry outputs
+            mask_edges=True,                  # Remove edge artifacts by using normals and depth
+            apply_confidence_mask=False,      # Filter low-confidence regions
+            confidence_percentile=10,         # Remove bottom 10 percentile confidence pixels
+        )
+    return predictions
+
 
-# resize, normalize, convert numpy array to pytorch tensors, batch
-# TODO: blog post says consider using pytorch Dataset and DataLoader for large datasets
-views = load_images(images)
-
-# Inference parameters
-predictions = model.infer(
-    views,                            # Input views
-    memory_efficient_inference=False, # TODO use for larger datasets? # Trades off speed for more views (up to 2000 views on 140 GB) 
-    use_amp=True,                     # Use mixed precision inference (recommended)
-    amp_dtype="bf16",                 # bf16 inference (recommended; falls back to fp16 if bf16 not supported)
-    apply_mask=True,                  # Apply masking to dense geometry outputs
-    mask_edges=True,                  # Remove edge artifacts by using normals and depth
-    apply_confidence_mask=False,      # Filter low-confidence regions
-    confidence_percentile=10,         # Remove bottom 10 percentile confidence pixels
-)
+# Guard: DataLoader workers re-import this module under spawn/forkserver,
+# so model loading and inference must not run at import time
+if __name__ == "__main__":
+    predictions = main()
@@ -13,14 +13,15 @@ creates a cleaned version with '_clean' suffix (e.g., splat_20000_clean.ply).
 
 Usage:
   python clean_splats.py --config splat_config.yml --patch p0
+  python clean_splats.py --config splat_config.yml --patch p0 p1 p2
 """
 
 import argparse
+import os
 import sys
 from pathlib import Path
 import yaml
 from wildflow import splat
-import re
 import json
 
 
@@ -38,38 +39,29 @@ def find_highest_iteration_splat(splat_dir: Path, patch_name: str) -> Path:
     Also supports legacy filenames without prefix: splat_10000.ply, splat_20000.ply
     Returns the one with the highest iteration number.
     """
-    # Try prefixed files first (e.g., p0_splat_10000.ply)
-    splat_files = list(splat_dir.glob(f'{patch_name}_splat_*.ply'))
-    
-    # Fall back to legacy non-prefixed files if none found
-    if not splat_files:
-        splat_files = list(splat_dir.glob('splat_*.ply'))
+    # Single directory pass: split 'p0_splat_10000.ply' into stem 'p0_splat' and
+    # iteration '10000' (non-numeric tails such as '_clean' are skipped)
+    prefixed_stem = f'{patch_name}_splat'
+    prefixed, legacy = [], []
+    with os.scandir(splat_dir) as it:
+        for entry in it:
+            name = entry.name
+            if not name.endswith('.ply'):
+                continue
+            stem, _, iteration = name[:-len('.ply')].rpartition('_')
+            if not iteration.isdigit():
+                continue
+            if stem == prefixed_stem:
+                prefixed.append((int(iteration), entry.path))
+            elif stem == 'splat':
+                legacy.append((int(iteration), entry.path))
     
+    # Prefer prefixed files, fall back to legacy non-prefixed files
+    splat_files = prefixed or legacy
     if not splat_files:
         raise FileNotFoundError(f"No splat_*.ply files found in {splat_dir}")
     
-    # Extract iteration numbers and find max
-    # Support both formats: p0_splat_10000.ply and splat_10000.ply
-    pattern_prefixed = re.compile(rf'{re.escape(patch_name)}_splat_(\d+)\.ply')
-    pattern_legacy = re.compile(r'splat_(\d+)\.ply')
-    max_iter = -1
-    max_file = None
-    
-    for f in splat_files:
-        match = pattern_prefixed.match(f.name)
-        if not match:
-            match = pattern_legacy.match(f.name)
-        
-        if match:
-            iteration = int(match.group(1))
-            if iteration > max_iter:
-                max_iter = iteration
-                max_file = f
-    
-    if max_file is None:
-        raise FileNotFoundError(f"No valid splat_*.ply files found in {splat_dir}")
-    
-    return max_file
+    return Path(max(splat_files)[1])
 
 
 def get_patch_boundaries(patch_dir: Path, buffer_meters: float) -> dict:
@@ -104,53 +96,32 @@ def get_patch_boundaries(patch_dir: Path, buffer_meters: float) -> dict:
     return boundaries
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description='Clean gaussian splat models using quality criteria',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Example:
-  python clean_splats.py --config splat_config.yml --patch p0
-  python clean_splats.py --config splat_config.yml
+def process_patch(patch_name: str, config: dict, overwrite=None):
+    """
+    Clean the highest iteration splat of a single patch.
 
-If --patch is not provided, uses cleanup.single_patch from config.
-        """
-    )
-    
-    parser.add_argument('--config', required=True,
-                       help='Path to splat_config.yml configuration file')
-    parser.add_argument('--patch',
-                       help='Patch name to clean (e.g., p0, p1, p2). If not provided, uses cleanup.single_patch from config.')
-    
-    args = parser.parse_args()
-    
-    # Load configuration
-    config_path = Path(args.config).expanduser()
-    if not config_path.exists():
-        print(f"ERROR: Config file not found: {config_path}")
-        sys.exit(2)
-    
-    config = load_config(config_path)
-    
+    overwrite controls what happens when the cleaned file already exists:
+    True overwrites, False skips, None asks (only if stdin is a terminal,
+    otherwise overwrites).
+
+    Returns the cleaned output path, or None if the patch was skipped.
+    Raises FileNotFoundError for missing inputs and RuntimeError if
+    wildflow.splat.cleanup_splats fails.
+    """
     # Extract paths and settings from config
     patches_dir = Path(config['paths']['patches_dir']).expanduser()
     cleanup_config = config['cleanup']
-    patching_config = config.get('patching', {})
     
-    # Get patch name from args or config
-    patch_name = args.patch if args.patch else cleanup_config.get('single_patch', 'p0')
     patch_dir = patches_dir / patch_name
     splat_dir = patch_dir / "sparse" / "splat"
     
     # Validate paths
     if not patch_dir.exists():
-        print(f"ERROR: Patch directory not found: {patch_dir}")
-        sys.exit(2)
+        raise FileNotFoundError(f"Patch directory not found: {patch_dir}")
     
     if not splat_dir.exists():
-        print(f"ERROR: Splat directory not found: {splat_dir}")
-        print(f"       Train the splat first using train_splat.py")
-        sys.exit(2)
+        raise FileNotFoundError(f"Splat directory not found: {splat_dir}\n"
+                                f"       Train the splat first using train_splat.py")
     
     print("="*70)
     print("Gaussian Splat Cleanup")
@@ -160,12 +131,8 @@ If --patch is not provided, uses cleanup.single_patch from config.
     print()
     
     # Find highest iteration splat file
-    try:
-        input_file = find_highest_iteration_splat(splat_dir, patch_name)
-        print(f"Found splat file: {input_file.name}")
-    except FileNotFoundError as e:
-        print(f"ERROR: {e}")
-        sys.exit(2)
+    input_file = find_highest_iteration_splat(splat_dir, patch_name)
+    print(f"Found splat file: {input_file.name}")
     
     # Create output filename with '_clean' suffix
     base_name = input_file.stem  # e.g., 'splat_20000'
@@ -174,10 +141,16 @@ If --patch is not provided, uses cleanup.single_patch from config.
     # Check if already cleaned
     if output_file.exists():
         print(f"\nWARNING: Cleaned file already exists: {output_file.name}")
-        response = input("Overwrite? [y/N]: ")
-        if response.lower() != 'y':
-            print("Skipping cleanup")
-            sys.exit(0)
+        if overwrite is False:
+            print("Skipping cleanup (--no-clobber)")
+            return None
+        # Only prompt when someone can answer; batch runs (no tty) overwrite
+        if overwrite is None and sys.stdin.isatty():
+            response = input("Overwrite? [y/N]: ")
+            if response.lower() != 'y':
+                print("Skipping cleanup")
+                return None
+        print("Overwriting")
     
     print()
     print("Cleanup parameters:")
@@ -218,21 +191,107 @@ If --patch is not provided, uses cleanup.single_patch from config.
     print("Running wildflow.splat.cleanup_splats...")
     try:
         splat.cleanup_splats(cleanup_params)
-        print()
-        print(f"SUCCESS: Cleaned splat saved to: {output_file.name}")
-        
-        # Show file sizes for comparison
-        input_size_mb = input_file.stat().st_size / (1024 * 1024)
-        output_size_mb = output_file.stat().st_size / (1024 * 1024)
-        
-        print()
-        print("File sizes:")
-        print(f"  Original:  {input_size_mb:.1f} MB")
-        print(f"  Cleaned:   {output_size_mb:.1f} MB")
-        print(f"  Removed:   {input_size_mb - output_size_mb:.1f} MB ({100 * (1 - output_size_mb/input_size_mb):.1f}%)")
-        
     except Exception as e:
-        print(f"\nERROR: Cleanup failed: {e}")
+        raise RuntimeError(f"Cleanup failed: {e}") from e
+    
+    print()
+    print(f"SUCCESS: Cleaned splat saved to: {output_file.name}")
+    
+    # Show file sizes for comparison
+    input_size_mb = input_file.stat().st_size / (1024 * 1024)
+    output_size_mb = output_file.stat().st_size / (1024 * 1024)
+    
+    print()
+    print("File sizes:")
+    print(f"  Original:  {input_size_mb:.1f} MB")
+    print(f"  Cleaned:   {output_size_mb:.1f} MB")
+    print(f"  Removed:   {input_size_mb - output_size_mb:.1f} MB ({100 * (1 - output_size_mb/input_size_mb):.1f}%)")
+    
+    return output_file
+
+
+def clean_all_patches(config: dict, patches: list, overwrite=None) -> list:
+    """
+    Clean several patches in one process, sharing the loaded wildflow module.
+    
+    A failing patch is reported and the loop moves on to the next one.
+    Returns the list of patch names that failed.
+    """
+    failed = []
+    for patch_name in patches:
+        try:
+            process_patch(patch_name, config, overwrite)
+        except Exception as e:
+            print(f"\nERROR: {patch_name}: {e}")
+            failed.append(patch_name)
+        print()
+    
+    if len(patches) > 1:
+        print("="*70)
+        print(f"Cleaned {len(patches) - len(failed)}/{len(patches)} patches")
+        if failed:
+            print(f"Failed: {', '.join(failed)}")
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Clean gaussian splat models using quality criteria',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Example:
+  python clean_splats.py --config splat_config.yml --patch p0
+  python clean_splats.py --config splat_config.yml --patch p0 p1 p2 --yes
+  python clean_splats.py --config splat_config.yml
+  parallel -j8 python clean_splats.py --config splat_config.yml --yes --patch {} ::: p0 p1 p2
+
+If --patch is not provided, uses cleanup.single_patch from config.
+If the cleaned file already exists, asks before overwriting when run from a
+terminal; --yes overwrites and --no-clobber skips without asking.
+        """
+    )
+    
+    parser.add_argument('--config', required=True,
+                       help='Path to splat_config.yml configuration file')
+    parser.add_argument('--patch', nargs='+',
+                       help='Patch name(s) to clean (e.g., p0 p1 p2). If not provided, uses cleanup.single_patch from config.')
+    parser.add_argument('--yes', '-y', action='store_true',
+                       help='Overwrite an existing cleaned file without asking')
+    parser.add_argument('--no-clobber', action='store_true',
+                       help='Skip the patch if a cleaned file already exists')
+    
+    args = parser.parse_args()
+    
+    # Load configuration
+    config_path = Path(args.config).expanduser()
+    if not config_path.exists():
+        print(f"ERROR: Config file not found: {config_path}")
+        sys.exit(2)
+    
+    config = load_config(config_path)
+    
+    # Get patch name(s) from args or config
+    patches = args.patch if args.patch else [config['cleanup'].get('single_patch', 'p0')]
+    
+    if args.no_clobber:
+        overwrite = False
+    elif args.yes:
+        overwrite = True
+    else:
+        overwrite = None
+    
+    if len(patches) > 1:
+        failed = clean_all_patches(config, patches, overwrite)
+        sys.exit(1 if failed else 0)
+    
+    # Single patch: keep the exit codes (2 = missing input, 1 = cleanup failed)
+    try:
+        process_patch(patches[0], config, overwrite)
+    except FileNotFoundError as e:
+        print(f"ERROR: {e}")
+        sys.exit(2)
+    except RuntimeError as e:
+        print(f"\nERROR: {e}")
         sys.exit(1)
 
 
@@ -3,7 +3,9 @@
 merge_splats.py
 
 Merge all cleaned gaussian splat patches into a single unified PLY file.
-Uses wildflow.splat.merge_ply_files to concatenate vertex data from all patches.
+Binary PLYs with identical vertex properties are merged by streaming: one header
+with the summed vertex count, then the raw vertex payloads copied back to back.
+Otherwise falls back to wildflow.splat.merge_ply_files.
 
 The script finds all cleaned splat files (*_clean.ply) or raw splat files
 and merges them into a single output file.
@@ -13,11 +15,22 @@ Usage:
 """
 
 import argparse
+import os
+import shutil
 import sys
 from pathlib import Path
 import yaml
 from wildflow import splat
-import re
+
+
+# Byte size of each PLY scalar property type
+PLY_TYPE_SIZES = {
+    'char': 1, 'uchar': 1, 'int8': 1, 'uint8': 1,
+    'short': 2, 'ushort': 2, 'int16': 2, 'uint16': 2,
+    'int': 4, 'uint': 4, 'int32': 4, 'uint32': 4,
+    'float': 4, 'float32': 4,
+    'double': 8, 'float64': 8,
+}
 
 
 def load_config(config_path: Path) -> dict:
@@ -26,32 +39,161 @@ def load_config(config_path: Path) -> dict:
         return yaml.safe_load(f)
 
 
-def find_highest_iteration_splat(splat_dir: Path, patch_name: str, prefer_cleaned: bool = True) -> Path:
+def read_ply_header(path: Path) -> dict:
+    """
+    Parse the header of a binary, vertex-only PLY file.
+    
+    Returns dict with format line, vertex count, property lines, and header and
+    file size in bytes. Raises ValueError if the file can't be merged by
+    plain concatenation (ascii, extra elements, list properties, bad size).
+    """
+    with open(path, 'rb') as f:
+        if f.readline().strip() != b'ply':
+            raise ValueError(f"Not a PLY file: {path}")
+        
+        fmt = None
+        vertex_count = None
+        properties = []
+        while True:
+            line = f.readline()
+            if not line:
+                raise ValueError(f"No end_header in {path}")
+            words = line.split()
+            if not words or words[0] in (b'comment', b'obj_info'):
+                continue
+            if words[0] == b'end_header':
+                break
+            if words[0] == b'format':
+                fmt = line.strip()
+            elif words[0] == b'element':
+                if words[1] != b'vertex' or vertex_count is not None:
+                    raise ValueError(f"Only a single vertex element is supported: {path}")
+                vertex_count = int(words[2])
+            elif words[0] == b'property':
+                if words[1] == b'list':
+                    raise ValueError(f"List properties are not supported: {path}")
+                properties.append(line.strip())
+        header_size = f.tell()
+    
+    if fmt is None or not fmt.startswith(b'format binary_'):
+        raise ValueError(f"Only binary PLY files are supported: {path}")
+    if vertex_count is None:
+        raise ValueError(f"No vertex element in {path}")
+    
+    row_size = sum(PLY_TYPE_SIZES[p.split()[1].decode()] for p in properties)
+    file_size = path.stat().st_size
+    if file_size != header_size + vertex_count * row_size:
+        raise ValueError(f"Unexpected file size for {vertex_count} vertices: {path}")
+    
+    return {
+        "format": fmt,
+        "vertex_count": vertex_count,
+        "properties": properties,
+        "header_size": header_size,
+        "file_size": file_size,
+    }
+
+
+def copy_payload(src, out, offset: int, count: int):
+    """
+    Append count bytes of src (starting at offset) to out, in-kernel where possible:
+    os.copy_file_range (Linux, may reflink), then os.sendfile, then copyfileobj.
+    """
+    out.flush()
+    src_fd, out_fd = src.fileno(), out.fileno()
+    out_offset = out.tell()
+    remaining = count
+    
+    for copy in (getattr(os, 'copy_file_range', None), getattr(os, 'sendfile', None)):
+        if copy is None:
+            continue
+        try:
+            while remaining > 0:
+                if copy is os.sendfile:
+                    os.lseek(out_fd, out_offset, os.SEEK_SET)
+                    n = os.sendfile(out_fd, src_fd, offset, remaining)
+                else:
+                    n = os.copy_file_range(src_fd, out_fd, remaining, offset, out_offset)
+                if n == 0:
+                    raise ValueError(f"Unexpected end of file in {src.name}")
+                offset += n
+                out_offset += n
+                remaining -= n
+            out.seek(out_offset)
+            return
+        except OSError:
+            continue  # Unsupported here (old kernel, cross-device, ...), try the next one
+    
+    src.seek(offset)
+    out.seek(out_offset)
+    shutil.copyfileobj(src, out, length=1 << 20)
+
+
+def merge_splats_stream(input_files: list, output_file: Path) -> int:
+    """
+    Merge binary PLY files that share the same vertex properties, without loading
+    any vertex data: write one header with the summed vertex count, then copy each
+    file's vertex payload byte for byte.
+    
+    Returns the total vertex count. Raises ValueError (before writing anything)
+    if the inputs can't be concatenated.
+    """
+    headers = [read_ply_header(Path(f)) for f in input_files]
+    
+    ref = headers[0]
+    for f, h in zip(input_files, headers):
+        if h["format"] != ref["format"] or h["properties"] != ref["properties"]:
+            raise ValueError(f"Vertex properties of {f} differ from {input_files[0]}")
+    
+    total_vertices = sum(h["vertex_count"] for h in headers)
+    header = b'\n'.join([
+        b'ply',
+        ref["format"],
+        b'comment merged by merge_splats.py',
+        f'element vertex {total_vertices}'.encode(),
+        *ref["properties"],
+        b'end_header',
+    ]) + b'\n'
+    
+    with open(output_file, 'wb') as out:
+        out.write(header)
+        for f, h in zip(input_files, headers):
+            with open(f, 'rb') as src:
+                copy_payload(src, out, h["header_size"], h["file_size"] - h["header_size"])
+    
+    return total_vertices
+
+
+def find_highest_iteration_splat(splat_dir, patch_name: str, prefer_cleaned: bool = True):
     """
     Find the splat PLY file with the highest iteration number.
     
     If prefer_cleaned=True, looks for cleaned files (*_clean.ply) first.
     Falls back to raw splat files if cleaned versions don't exist.
     
-    Returns the path to the best available splat file.
+    splat_dir may be a Path or str. Returns (Path, size_bytes) of the best
+    available splat file, or None.
     """
-    # Pattern for prefixed files (e.g., p0_splat_10000.ply, p0_splat_10000_clean.ply)
-    pattern_prefixed = re.compile(rf'{re.escape(patch_name)}_splat_(\d+)(_clean)?\.ply')
-    # Pattern for legacy files (e.g., splat_10000.ply, splat_10000_clean.ply)
-    pattern_legacy = re.compile(r'splat_(\d+)(_clean)?\.ply')
+    # Prefixed files (e.g., p0_splat_10000.ply, p0_splat_10000_clean.ply) and
+    # legacy files (e.g., splat_10000.ply, splat_10000_clean.ply)
+    # (stems built once per call, not per directory entry)
+    valid_stems = {f'{patch_name}_splat', 'splat'}
     
-    # Collect all splat files with their iteration numbers
+    # Collect all splat files with their iteration numbers (single directory pass)
     splat_files = []
     
-    for f in splat_dir.glob('*.ply'):
-        match = pattern_prefixed.match(f.name)
-        if not match:
-            match = pattern_legacy.match(f.name)
-        
-        if match:
-            iteration = int(match.group(1))
-            is_clean = match.group(2) is not None
-            splat_files.append((f, iteration, is_clean))
+    with os.scandir(splat_dir) as it:
+        for entry in it:
+            name = entry.name
+            if not name.endswith('.ply'):
+                continue
+            stem = name[:-len('.ply')]
+            is_clean = stem.endswith('_clean')
+            if is_clean:
+                stem = stem[:-len('_clean')]
+            prefix, _, iteration = stem.rpartition('_')
+            if iteration.isdigit() and prefix in valid_stems:
+                splat_files.append((entry, int(iteration), is_clean))
     
     if not splat_files:
         return None
@@ -62,48 +204,57 @@ def find_highest_iteration_splat(splat_dir: Path, patch_name: str, prefer_cleane
     # Filter to highest iteration files
     max_iter_files = [f for f in splat_files if f[1] == max_iter]
     
+    best = None
     if prefer_cleaned:
         # Prefer cleaned version at highest iteration
         cleaned = [f for f in max_iter_files if f[2]]
         if cleaned:
-            return cleaned[0][0]
-    
-    # Fall back to raw version
-    raw = [f for f in max_iter_files if not f[2]]
-    if raw:
-        return raw[0][0]
-    
-    # If only cleaned exists and we didn't prefer it, still use it
-    if max_iter_files:
-        return max_iter_files[0][0]
+            best = cleaned[0][0]
+    
+    if best is None:
+        # Fall back to raw version
+        raw = [f for f in max_iter_files if not f[2]]
+        if raw:
+            best = raw[0][0]
+        # If only cleaned exists and we didn't prefer it, still use it
+        elif max_iter_files:
+            best = max_iter_files[0][0]
+    
+    if best is None:
+        return None
     
-    return None
+    # Only the chosen file is stat'ed; the size is reused for the report
+    return Path(best.path), best.stat().st_size
 
 
 def find_all_patch_splats(patches_dir: Path, prefer_cleaned: bool = True) -> list:
     """
     Find all patch splat files in the patches directory.
     
-    Returns list of tuples: (patch_name, splat_file_path)
+    Returns list of tuples: (patch_name, splat_file_path, size_bytes)
     """
     patches = []
     
-    # Find all patch directories (p0, p1, p2, ...)
-    patch_dirs = sorted(
-        [d for d in patches_dir.iterdir() if d.is_dir() and re.match(r'p\d+$', d.name)],
-        key=lambda d: int(d.name[1:])  # Sort by patch number
-    )
-    
-    for patch_dir in patch_dirs:
-        patch_name = patch_dir.name
-        splat_dir = patch_dir / "sparse" / "splat"
+    # Find all patch directories (p0, p1, p2, ...) in one pass, sorted by patch number
+    patch_dirs = []
+    with os.scandir(patches_dir) as it:
+        for entry in it:
+            name = entry.name
+            if len(name) > 1 and name[0] == 'p' and name[1:].isdigit() and entry.is_dir():
+                patch_dirs.append((int(name[1:]), name, entry.path))
+    patch_dirs.sort()
+    
+    # Plain str paths in the loop; only the chosen splat files become Path objects
+    for _, patch_name, patch_path in patch_dirs:
+        splat_dir = os.path.join(patch_path, "sparse", "splat")
         
-        if not splat_dir.exists():
+        if not os.path.isdir(splat_dir):
             continue
         
-        splat_file = find_highest_iteration_splat(splat_dir, patch_name, prefer_cleaned)
-        if splat_file:
-            patches.append((patch_name, splat_file))
+        found = find_highest_iteration_splat(splat_dir, patch_name, prefer_cleaned)
+        if found:
+            splat_file, size_bytes = found
+            patches.append((patch_name, splat_file, size_bytes))
     
     return patches
 
@@ -145,6 +296,7 @@ Configuration file should contain merge parameters and paths.
         output_file = patches_dir / "merged_splat.ply"
     
     prefer_cleaned = merge_config.get('prefer_cleaned', True)
+    stream_merge = merge_config.get('stream_merge', True)
     
     # Validate patches directory
     if not patches_dir.exists():
@@ -157,6 +309,7 @@ Configuration file should contain merge parameters and paths.
     print(f"Patches dir:    {patches_dir}")
     print(f"Output file:    {output_file}")
     print(f"Prefer cleaned: {prefer_cleaned}")
+    print(f"Stream merge:   {stream_merge}")
     print()
     
     # Find all patch splat files
@@ -169,8 +322,8 @@ Configuration file should contain merge parameters and paths.
     
     print(f"Found {len(patch_splats)} patch splat files to merge:")
     total_size_mb = 0
-    for patch_name, splat_file in patch_splats:
-        size_mb = splat_file.stat().st_size / (1024 * 1024)
+    for patch_name, splat_file, size_bytes in patch_splats:
+        size_mb = size_bytes / (1024 * 1024)
         total_size_mb += size_mb
         clean_marker = " (cleaned)" if "_clean" in splat_file.name else " (raw)"
         print(f"  {patch_name}: {splat_file.name}{clean_marker} ({size_mb:.1f} MB)")
@@ -191,15 +344,27 @@ Configuration file should contain merge parameters and paths.
     # Ensure output directory exists
     output_file.parent.mkdir(parents=True, exist_ok=True)
     
-    # Build merge configuration
-    merge_params = {
-        "input_files": [str(f) for _, f in patch_splats],
-        "output_file": str(output_file)
-    }
+    input_files = [str(f) for _, f, _ in patch_splats]
     
-    print("Running wildflow.splat.merge_ply_files...")
     try:
-        splat.merge_ply_files(merge_params)
+        if stream_merge:
+            try:
+                print("Merging by streaming vertex payloads...")
+                total_vertices = merge_splats_stream(input_files, output_file)
+                print(f"  {total_vertices:,} vertices")
+            except ValueError as e:
+                print(f"  Can't stream-merge ({e})")
+                stream_merge = False
+        
+        if not stream_merge:
+            # Build merge configuration
+            merge_params = {
+                "input_files": input_files,
+                "output_file": str(output_file)
+            }
+            
+            print("Running wildflow.splat.merge_ply_files...")
+            splat.merge_ply_files(merge_params)
         
         print()
         print(f"SUCCESS: Merged splat saved to: {output_file}")
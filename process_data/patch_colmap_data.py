@@ -18,19 +18,52 @@ Configuration is read from splat_config.yml which contains:
 
 import argparse
 import os
+import struct
 import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import chain, repeat
+import numpy as np
 import pycolmap
 from pathlib import Path
 from wildflow import splat
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import yaml
 import json
 
+# Use the libyaml-backed loader when PyYAML was built with it
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# COLMAP camera model id -> (name, number of params)
+CAMERA_MODELS = {
+    0: ("SIMPLE_PINHOLE", 3),
+    1: ("PINHOLE", 4),
+    2: ("SIMPLE_RADIAL", 4),
+    3: ("RADIAL", 5),
+    4: ("OPENCV", 8),
+    5: ("OPENCV_FISHEYE", 8),
+    6: ("FULL_OPENCV", 12),
+    7: ("FOV", 5),
+    8: ("SIMPLE_RADIAL_FISHEYE", 4),
+    9: ("RADIAL_FISHEYE", 5),
+    10: ("THIN_PRISM_FISHEYE", 12),
+}
+# cameras.bin record header: camera_id, model_id, width, height (params follow as doubles)
+CAMERA_RECORD = struct.Struct("<iiQQ")
+# images.bin per-image record: IMAGE_ID, QW, QX, QY, QZ, TX, TY, TZ, CAMERA_ID
+IMAGE_RECORD = struct.Struct("<IdddddddI")
+# images.bin 2D observation: X, Y, POINT3D_ID (-1 if not triangulated)
+POINT2D_DTYPE = np.dtype([("x", "<f8"), ("y", "<f8"), ("point3D_id", "<i8")])
+# points3D.bin per-point record: POINT3D_ID, X, Y, Z, R, G, B, ERROR
+POINT3D_RECORD = struct.Struct("<QdddBBBd")
+# points3D.bin track entry: IMAGE_ID, POINT2D_IDX (both uint32)
+TRACK_DTYPE = "<u4"
+
 
 def load_config(config_path: Path) -> dict:
     """Load configuration from YAML file."""
     with open(config_path, 'r') as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=YAML_LOADER)
 
 
 class PatchConfig:
@@ -54,6 +87,9 @@ class PatchConfig:
         self.buffer_meters = patch_cfg.get('buffer_meters', 0.8)
         self.sample_percentage = patch_cfg.get('sample_percentage', 5.0)
         self.use_colmap_points = patch_cfg.get('use_colmap_points', True)
+        self.export_txt = patch_cfg.get('export_txt', False)
+        self.fast_txt = patch_cfg.get('fast_txt', False)
+        self.verify_txt = patch_cfg.get('verify_txt', False)
         
         # Validate inputs
         self._validate()
@@ -85,6 +121,253 @@ class PatchConfig:
             raise FileNotFoundError(f"Point cloud file not found: {self.pointcloud_path}")
 
 
+def write_cameras_txt(patch_sparse: str) -> int:
+    """Transcode cameras.bin to cameras.txt directly. Returns the number of cameras."""
+    with open(os.path.join(patch_sparse, "cameras.bin"), 'rb') as f:
+        data = f.read()
+    
+    num_cameras, = struct.unpack_from("<Q", data, 0)
+    offset = 8
+    cameras = []
+    for _ in range(num_cameras):
+        camera_id, model_id, width, height = CAMERA_RECORD.unpack_from(data, offset)
+        offset += CAMERA_RECORD.size
+        model_name, num_params = CAMERA_MODELS[model_id]
+        params = struct.unpack_from(f"<{num_params}d", data, offset)
+        offset += 8 * num_params
+        cameras.append((camera_id, model_name, width, height, params))
+    
+    lines = [
+        "# Camera list with one line of data per camera:\n",
+        "#   CAMERA_ID, MODEL, WIDTH, HEIGHT, PARAMS[]\n",
+        f"# Number of cameras: {num_cameras}\n",
+    ]
+    for camera_id, model_name, width, height, params in sorted(cameras):
+        params_str = " ".join(repr(p) for p in params)
+        lines.append(f"{camera_id} {model_name} {width} {height} {params_str}\n")
+    with open(os.path.join(patch_sparse, "cameras.txt"), 'w') as f:
+        f.writelines(lines)
+    return num_cameras
+
+
+def read_image_names(patch_sparse: str) -> List[str]:
+    """Read just the sorted image names from images.bin, skipping poses and 2D points."""
+    with open(os.path.join(patch_sparse, "images.bin"), 'rb') as f:
+        data = f.read()
+    
+    num_images, = struct.unpack_from("<Q", data, 0)
+    offset = 8
+    image_names = []
+    for _ in range(num_images):
+        offset += IMAGE_RECORD.size
+        name_end = data.index(b"\0", offset)
+        image_names.append(data[offset:name_end].decode())
+        num_points2d, = struct.unpack_from("<Q", data, name_end + 1)
+        offset = name_end + 9 + num_points2d * POINT2D_DTYPE.itemsize
+    return sorted(image_names)
+
+
+def write_images_txt(patch_sparse: str) -> List[str]:
+    """
+    Transcode images.bin to images.txt directly, without a pycolmap Reconstruction.
+    
+    Uses COLMAP's text layout: two lines per image, the second holding every 2D
+    observation as X Y POINT3D_ID. Long second rows are therefore expected.
+    Returns the sorted image names.
+    """
+    with open(os.path.join(patch_sparse, "images.bin"), 'rb') as f:
+        data = f.read()
+    
+    num_images, = struct.unpack_from("<Q", data, 0)
+    offset = 8
+    lines = []
+    image_names = []
+    num_observations = 0
+    for _ in range(num_images):
+        image_id, qw, qx, qy, qz, tx, ty, tz, camera_id = IMAGE_RECORD.unpack_from(data, offset)
+        offset += IMAGE_RECORD.size
+        name_end = data.index(b"\0", offset)
+        name = data[offset:name_end].decode()
+        offset = name_end + 1
+        num_points2d, = struct.unpack_from("<Q", data, offset)
+        offset += 8
+        points2d = np.frombuffer(data, dtype=POINT2D_DTYPE, count=num_points2d, offset=offset)
+        offset += points2d.nbytes
+        
+        num_observations += int(np.count_nonzero(points2d["point3D_id"] != -1))
+        image_names.append(name)
+        lines.append(f"{image_id} {qw!r} {qx!r} {qy!r} {qz!r} {tx!r} {ty!r} {tz!r} {camera_id} {name}\n")
+        # One bulk %-format per image instead of a join over per-point f-strings
+        lines.append(" ".join(["%r %r %d"] * num_points2d) % tuple(chain.from_iterable(points2d.tolist())) + "\n")
+    
+    mean_observations = num_observations / num_images if num_images else 0
+    with open(os.path.join(patch_sparse, "images.txt"), 'w') as f:
+        f.write("# Image list with two lines of data per image:\n"
+                "#   IMAGE_ID, QW, QX, QY, QZ, TX, TY, TZ, CAMERA_ID, NAME\n"
+                "#   POINTS2D[] as (X, Y, POINT3D_ID)\n"
+                f"# Number of images: {num_images}, mean observations per image: {mean_observations}\n")
+        f.writelines(lines)
+    return sorted(image_names)
+
+
+def write_points3d_txt(patch_sparse: str) -> int:
+    """
+    Transcode points3D.bin to points3D.txt directly, without a pycolmap Reconstruction.
+    
+    Each line is POINT3D_ID X Y Z R G B ERROR followed by the track as
+    (IMAGE_ID, POINT2D_IDX) pairs. Returns the number of points.
+    """
+    with open(os.path.join(patch_sparse, "points3D.bin"), 'rb') as f:
+        data = f.read()
+    
+    num_points, = struct.unpack_from("<Q", data, 0)
+    offset = 8
+    lines = []
+    track_total = 0
+    for _ in range(num_points):
+        point3d_id, x, y, z, r, g, b, error = POINT3D_RECORD.unpack_from(data, offset)
+        offset += POINT3D_RECORD.size
+        track_length, = struct.unpack_from("<Q", data, offset)
+        offset += 8
+        track = np.frombuffer(data, dtype=TRACK_DTYPE, count=2 * track_length, offset=offset)
+        offset += track.nbytes
+        track_total += track_length
+        track_str = " ".join(map(str, track.tolist()))
+        lines.append(f"{point3d_id} {x!r} {y!r} {z!r} {r} {g} {b} {error!r} {track_str}\n")
+    
+    mean_track_length = track_total / num_points if num_points else 0
+    with open(os.path.join(patch_sparse, "points3D.txt"), 'w') as f:
+        f.write("# 3D point list with one line of data per point:\n"
+                "#   POINT3D_ID, X, Y, Z, R, G, B, ERROR, TRACK[] as (IMAGE_ID, POINT2D_IDX)\n"
+                f"# Number of points: {num_points}, mean track length: {mean_track_length}\n")
+        f.writelines(lines)
+    return num_points
+
+
+def _pose_arrays(image):
+    """Quaternion and translation of an image's cam_from_world (a method in pycolmap >= 3.12, a property before)."""
+    pose = image.cam_from_world() if callable(image.cam_from_world) else image.cam_from_world
+    return pose.rotation.quat, pose.translation
+
+
+def verify_txt_export(patch_sparse: str) -> Optional[str]:
+    """
+    Round-trip check for a patch's .txt export.
+    
+    Reads the .txt files back with pycolmap and compares them to the .bin reconstruction:
+    camera models and params, image names, poses and 2D points, and 3D points with
+    their tracks. Values must match exactly (both writers use round-trip float formatting).
+    Returns None if they match, otherwise a description of the first difference.
+    """
+    from_bin = pycolmap.Reconstruction()
+    from_bin.read_binary(patch_sparse)
+    from_txt = pycolmap.Reconstruction()
+    from_txt.read_text(patch_sparse)
+    
+    if set(from_bin.cameras) != set(from_txt.cameras):
+        return "camera ids differ"
+    for camera_id, cam in from_bin.cameras.items():
+        other = from_txt.cameras[camera_id]
+        if (cam.model != other.model or cam.width != other.width or cam.height != other.height
+                or not np.array_equal(cam.params, other.params)):
+            return f"camera {camera_id} differs"
+    
+    if set(from_bin.images) != set(from_txt.images):
+        return "image ids differ"
+    for image_id, img in from_bin.images.items():
+        other = from_txt.images[image_id]
+        if img.name != other.name or img.camera_id != other.camera_id:
+            return f"image {image_id} name or camera differs"
+        if not all(np.array_equal(a, b) for a, b in zip(_pose_arrays(img), _pose_arrays(other))):
+            return f"image {image_id} ({img.name}) pose differs"
+        if len(img.points2D) != len(other.points2D):
+            return f"image {image_id} ({img.name}) has a different number of 2D points"
+        for p, q in zip(img.points2D, other.points2D):
+            if p.point3D_id != q.point3D_id or not np.array_equal(p.xy, q.xy):
+                return f"image {image_id} ({img.name}) 2D points differ"
+    
+    if set(from_bin.points3D) != set(from_txt.points3D):
+        return "3D point ids differ"
+    for point3d_id, point in from_bin.points3D.items():
+        other = from_txt.points3D[point3d_id]
+        if (not np.array_equal(point.xyz, other.xyz) or not np.array_equal(point.color, other.color)
+                or point.error != other.error):
+            return f"3D point {point3d_id} differs"
+        track = [(e.image_id, e.point2D_idx) for e in point.track.elements]
+        if track != [(e.image_id, e.point2D_idx) for e in other.track.elements]:
+            return f"3D point {point3d_id} track differs"
+    return None
+
+
+def _export_points_txt(patch_sparse: str, fast_txt: bool = False, verify: bool = False):
+    """
+    Write one patch's points3D.txt (runs in a worker process). Returns (error or None, num points).
+    
+    pycolmap rewrites the whole patch as .txt unless fast_txt is set, in which case only
+    points3D.bin is transcoded. With verify the export is round-trip checked afterwards.
+    """
+    try:
+        if fast_txt:
+            num_points = write_points3d_txt(patch_sparse)
+        else:
+            reconstruction = pycolmap.Reconstruction(patch_sparse)
+            reconstruction.write_text(patch_sparse)
+            num_points = len(reconstruction.points3D)
+        if verify:
+            mismatch = verify_txt_export(patch_sparse)
+            if mismatch:
+                return f"round-trip check failed: {mismatch}", num_points
+        return None, num_points
+    except Exception as e:
+        return str(e), 0
+
+
+def print_banner(title: str):
+    """Print a section banner as a single write (stdout, so it stays in order with the step output)."""
+    print(f"\n{'=' * 70}\n{title}\n{'=' * 70}")
+
+
+def _export_patch_txt(patch_sparse: str, export_txt: bool = True, fast_txt: bool = False,
+                      verify: bool = False):
+    """
+    Re-export one patch's binary reconstruction as .txt (runs in a worker process).
+    
+    By default pycolmap loads the patch and writes the .txt files. With fast_txt each
+    .bin file is transcoded straight to .txt instead, without building a Reconstruction.
+    With verify the written .txt files are read back and compared to the .bin files.
+    Returns (error message or None, number of 3D points, sorted image names).
+    The image names are returned so the patch metadata doesn't need to parse the
+    reconstruction a second time; they are None if images.bin couldn't be read.
+    With export_txt=False nothing is written and only the image names are read.
+    """
+    # The image names in COLMAP already include relative paths (e.g., "left/0001.png" or "0001.png")
+    try:
+        if not export_txt:
+            return None, 0, read_image_names(patch_sparse)
+        # The transcoder returns the names anyway; pycolmap's export needs them read separately
+        image_names = write_images_txt(patch_sparse) if fast_txt else read_image_names(patch_sparse)
+    except Exception as e:
+        return str(e), 0, None
+    
+    try:
+        if fast_txt:
+            write_cameras_txt(patch_sparse)
+            num_points = 0
+            if os.path.exists(os.path.join(patch_sparse, "points3D.bin")):
+                num_points = write_points3d_txt(patch_sparse)
+        else:
+            reconstruction = pycolmap.Reconstruction(patch_sparse)
+            reconstruction.write_text(patch_sparse)
+            num_points = len(reconstruction.points3D)
+        if verify:
+            mismatch = verify_txt_export(patch_sparse)
+            if mismatch:
+                return f"round-trip check failed: {mismatch}", num_points, image_names
+    except Exception as e:
+        return str(e), 0, image_names
+    return None, num_points, image_names
+
+
 def step1_create_patches(config: PatchConfig):
     """
     Create patches based on camera positions.
@@ -92,20 +375,22 @@ def step1_create_patches(config: PatchConfig):
     Analyzes camera positions and creates overlapping rectangular patches
     that each contain at most max_cameras cameras.
     """
-    print(f"\n{'='*70}")
-    print("STEP 1: Creating Patches")
-    print(f"{'='*70}")
+    print_banner("STEP 1: Creating Patches")
     
     model = pycolmap.Reconstruction(str(config.sparse_path))
-    camera_poses = [img.projection_center() for img in model.images.values()]
-    camera_z_values = [pos[2] for pos in camera_poses]
-    cameras_2d = [(pos[0], pos[1]) for pos in camera_poses]
+    
+    # Camera centers into one preallocated (N, 3) array
+    camera_poses = np.empty((len(model.images), 3), dtype=np.float64)
+    for i, img in enumerate(model.images.values()):
+        camera_poses[i] = img.projection_center()
+    # splat.patches expects a list of (x, y) tuples of Python floats
+    cameras_2d = [(x, y) for x, y in camera_poses[:, :2].tolist()]
     
     print(f"Total cameras: {len(cameras_2d)}")
     
     # Add some Z buffer for points above/below camera heights
-    min_z = min(camera_z_values) - 2.0
-    max_z = max(camera_z_values) + 0.5
+    min_z = float(camera_poses[:, 2].min()) - 2.0
+    max_z = float(camera_poses[:, 2].max()) + 0.5
     
     patches_list = splat.patches(
         cameras_2d, 
@@ -121,65 +406,70 @@ def step1_create_patches(config: PatchConfig):
     return patches_list, min_z, max_z
 
 
-def step2_split_cameras(config: PatchConfig, patches_list: List[Dict], min_z: float, max_z: float):
+def step2_split_cameras(config: PatchConfig, patches_list: List[Dict], min_z: float, max_z: float,
+                        patch_sparse_dirs: List[Path], pool: Optional[ProcessPoolExecutor] = None):
     """
     Split cameras.bin and images.bin into patches.
     
     Each patch gets its own sparse/0 directory with cameras.bin and images.bin.
     If use_colmap_points=True, also splits points3D.bin from COLMAP reconstruction.
     """
-    print(f"\n{'='*70}")
-    print("STEP 2: Splitting Cameras & Images")
+    title = "STEP 2: Splitting Cameras & Images"
     if config.use_colmap_points:
-        print("         (including COLMAP points3D.bin)")
-    print(f"{'='*70}")
+        title += "\n         (including COLMAP points3D.bin)"
+    print_banner(title)
+    
+    # Attach output paths in place rather than copying every patch dict
+    for patch, sparse_dir in zip(patches_list, patch_sparse_dirs):
+        patch["output_path"] = str(sparse_dir)
     
     result = splat.split_cameras({
         "input_path": str(config.sparse_path),
         "min_z": min_z,
         "max_z": max_z,
         "save_points3d": config.use_colmap_points,  # Split COLMAP points if requested
-        "patches": [
-            {**patch, "output_path": str(config.output_path / f"p{i}" / "sparse" / "0")}
-            for i, patch in enumerate(patches_list)
-        ]
+        "patches": patches_list
     })
     
     print(f"✓ Split cameras: {result['total_cameras_written']} cameras, {result['total_images_written']} images")
     print(f"  across {len(patches_list)} patches")
     
-    # Export to .txt format as well for compatibility
-    print(f"\nExporting patches to .txt format...")
-    for i in range(len(patches_list)):
-        patch_sparse = config.output_path / f"p{i}" / "sparse" / "0"
-        if patch_sparse.exists():
-            try:
-                reconstruction = pycolmap.Reconstruction(str(patch_sparse))
-                reconstruction.write_text(str(patch_sparse))
-                #TODO: I think the images.txt may be being exported in wrong format. Way too many entries per row?
-                if config.use_colmap_points:
-                    print(f"  ✓ p{i}: cameras.txt, images.txt, points3D.txt exported")
-                else:
-                    print(f"  ✓ p{i}: cameras.txt, images.txt exported")
-            except Exception as e:
-                print(f"  ✗ p{i}: Failed to export txt - {e}")
+    # Optionally export to .txt format as well (patches in parallel). This also reads
+    # each patch's image names for the metadata below; with no .txt export that is
+    # all it does, so it runs inline instead of in the pool.
+    if config.export_txt:
+        print(f"\nExporting patches to .txt format...")
+    # Dirs are created up front, so check for a written reconstruction instead
+    to_export = [i for i, d in enumerate(patch_sparse_dirs) if (d / "cameras.bin").exists()]
+    mapper = pool.map if pool is not None else map
+    results = mapper(_export_patch_txt, [str(patch_sparse_dirs[i]) for i in to_export],
+                     repeat(config.export_txt), repeat(config.fast_txt), repeat(config.verify_txt))
+    patch_images = {}  # patch index -> image names, or the error if it couldn't be read
+    verified = " (round-trip verified)" if config.verify_txt else ""
+    for i, (error, _, image_names) in zip(to_export, results):
+        patch_images[i] = image_names if image_names is not None else error
+        # Note: images.txt rows are long by design - COLMAP puts all of an image's
+        # 2D observations (X Y POINT3D_ID triples) on its second line
+        if not config.export_txt:
+            continue
+        if error:
+            print(f"  ✗ p{i}: Failed to export txt - {error}")
+        elif config.use_colmap_points:
+            print(f"  ✓ p{i}: cameras.txt, images.txt, points3D.txt exported{verified}")
+        else:
+            print(f"  ✓ p{i}: cameras.txt, images.txt exported{verified}")
     
     # Save patch metadata (boundaries and image list) for each patch
     print(f"\nSaving patch metadata...")
     for i, patch in enumerate(patches_list):
-        patch_dir = config.output_path / f"p{i}"
-        patch_sparse = patch_dir / "sparse" / "0"
+        patch_dir = patch_sparse_dirs[i].parent.parent  # pN/
         metadata_file = patch_dir / "patch_metadata.json"
         
-        # Get image names from this patch's reconstruction
-        # The image names in COLMAP already include relative paths (e.g., "left/0001.png" or "0001.png")
-        image_names = []
-        if patch_sparse.exists():
-            try:
-                patch_reconstruction = pycolmap.Reconstruction(str(patch_sparse))
-                image_names = sorted([img.name for img in patch_reconstruction.images.values()])
-            except Exception as e:
-                print(f"  ⚠ p{i}: Could not read images from reconstruction - {e}")
+        # Image names were read from this patch's reconstruction during the .txt export
+        image_names = patch_images.get(i, [])
+        if isinstance(image_names, str):
+            print(f"  ⚠ p{i}: Could not read images from reconstruction - {image_names}")
+            image_names = []
         
         metadata = {
             "patch_id": i,
@@ -200,7 +490,8 @@ def step2_split_cameras(config: PatchConfig, patches_list: List[Dict], min_z: fl
     return {"result": result, "patches_count": len(patches_list)}
 
 
-def step3_split_pointcloud(config: PatchConfig, patches_list: List[Dict], min_z: float, max_z: float):
+def step3_split_pointcloud(config: PatchConfig, patches_list: List[Dict], min_z: float, max_z: float,
+                           patch_sparse_dirs: List[Path], pool: Optional[ProcessPoolExecutor] = None):
     """
     Split dense point cloud into patches.
     
@@ -211,72 +502,70 @@ def step3_split_pointcloud(config: PatchConfig, patches_list: List[Dict], min_z:
     Note: This is only used if --pointcloud is provided. If --use-colmap-points is used,
     the points3D.bin splitting happens in step2_split_cameras instead.
     """
+    print_banner("STEP 3: Splitting Point Cloud")
     if config.use_colmap_points:
-        print(f"\n{'='*70}")
-        print("STEP 3: Splitting Point Cloud")
-        print(f"{'='*70}")
         print("✓ Using COLMAP points3D.bin (already split in Step 2)")
         return {"skipped": False, "used_colmap_points": True}
     
     if not config.pointcloud_path:
-        print(f"\n{'='*70}")
-        print("STEP 3: Splitting Point Cloud")
-        print(f"{'='*70}")
         print("⚠️  No point cloud provided - skipping")
         print("   Patches will be created without points3D.bin")
         print("   You can train with random initialization or add points later")
         return {"skipped": True}
     
-    print(f"\n{'='*70}")
-    print("STEP 3: Splitting Point Cloud")
-    print(f"{'='*70}")
     print(f"Input: {config.pointcloud_path}")
     print(f"Sample percentage: {config.sample_percentage}%")
     
-    coords = lambda p: {k: p[k] for k in ('min_x', 'max_x', 'min_y', 'max_y')}
-    
     result = splat.split_point_cloud({
         "input_file": str(config.pointcloud_path),
         "min_z": min_z,
         "max_z": max_z,
         "sample_percentage": config.sample_percentage,
         "patches": [
-            {**coords(patch), "output_file": str(config.output_path / f"p{i}" / "sparse" / "0" / "points3D.bin")}
-            for i, patch in enumerate(patches_list)
+            {
+                "min_x": patch["min_x"],
+                "max_x": patch["max_x"],
+                "min_y": patch["min_y"],
+                "max_y": patch["max_y"],
+                "output_file": str(sparse_dir / "points3D.bin"),
+            }
+            for patch, sparse_dir in zip(patches_list, patch_sparse_dirs)
         ]
     })
     
     print(f"✓ Split point cloud: {result['points_loaded']:,} → {result['total_points_written']:,} points")
     print(f"  ({config.sample_percentage}% sampling)")
     
-    # Export to .txt format as well
+    if not config.export_txt:
+        return {"result": result}
+    
+    # Only points3D.bin changed here; with fast_txt just that file is transcoded (patches in parallel)
     print(f"\nExporting point clouds to .txt format...")
-    for i in range(len(patches_list)):
-        patch_sparse = config.output_path / f"p{i}" / "sparse" / "0"
-        points3d_bin = patch_sparse / "points3D.bin"
-        if points3d_bin.exists():
-            try:
-                reconstruction = pycolmap.Reconstruction(str(patch_sparse))
-                reconstruction.write_text(str(patch_sparse))
-                print(f"  ✓ p{i}: points3D.txt exported ({len(reconstruction.points3D)} points)")
-            except Exception as e:
-                print(f"  ✗ p{i}: Failed to export txt - {e}")
+    to_export = [i for i, d in enumerate(patch_sparse_dirs) if (d / "points3D.bin").exists()]
+    mapper = pool.map if pool is not None else map
+    results = mapper(_export_points_txt, [str(patch_sparse_dirs[i]) for i in to_export],
+                     repeat(config.fast_txt), repeat(config.verify_txt))
+    for i, (error, num_points) in zip(to_export, results):
+        if error:
+            print(f"  ✗ p{i}: Failed to export txt - {error}")
+        else:
+            verified = ", round-trip verified" if config.verify_txt else ""
+            print(f"  ✓ p{i}: points3D.txt exported ({num_points} points{verified})")
     
     return {"result": result}
 
 
 def print_summary(config: PatchConfig, patches_list: List[Dict]):
     """Print summary of what was created."""
-    print(f"\n{'='*70}")
-    print("SUMMARY")
-    print(f"{'='*70}")
+    print_banner("SUMMARY")
     print(f"Created {len(patches_list)} patches in: {config.output_path}")
     print()
+    txt = " + .txt" if config.export_txt else ""
     print("Each patch contains:")
     print("  sparse/0/")
-    print("    ├── cameras.bin + cameras.txt")
-    print("    ├── images.bin + images.txt")
-    print("    └── points3D.bin + points3D.txt (if point cloud provided)")
+    print(f"    ├── cameras.bin{txt}")
+    print(f"    ├── images.bin{txt}")
+    print(f"    └── points3D.bin{txt} (if point cloud provided)")
 
 def main():
     parser = argparse.ArgumentParser(
@@ -292,11 +581,23 @@ Configuration is read from splat_config.yml which should contain:
   - paths.patches_dir: Output directory for patches
   - patching.max_cameras: Maximum cameras per patch (default: 1200)
   - patching.buffer_meters: Overlap between patches in meters (default: 0.8)
+  - patching.export_txt: Also write .txt copies of each patch (default: false)
+  - patching.fast_txt: Transcode .bin to .txt directly instead of via pycolmap (default: false)
+  - patching.verify_txt: Read the .txt files back and compare them to the .bin files (default: false)
         """
     )
     
     parser.add_argument('--config', required=True,
                        help='Path to splat_config.yml configuration file')
+    parser.add_argument('--export-txt', action='store_true',
+                       help='Also write cameras/images/points3D .txt files for each patch. '
+                            'Off by default: COLMAP, gsplat and LichtFeld-Studio read the .bin files')
+    parser.add_argument('--fast-txt', action='store_true',
+                       help='With --export-txt, transcode each .bin file to .txt directly instead of '
+                            'loading the patch with pycolmap and calling write_text')
+    parser.add_argument('--verify-txt', action='store_true',
+                       help='With --export-txt, read the .txt files back with pycolmap and check they '
+                            'match the .bin reconstruction')
     
     args = parser.parse_args()
     
@@ -310,32 +611,45 @@ Configuration is read from splat_config.yml which should contain:
     
     # Create configuration object
     patch_config = PatchConfig(config)
-    
-    print("="*70)
-    print("COLMAP Patching Workflow")
-    print("="*70)
-    print(f"Input sparse:    {patch_config.sparse_path}")
-    print(f"Input images:    {patch_config.images_path}")
+    patch_config.export_txt = patch_config.export_txt or args.export_txt
+    patch_config.fast_txt = patch_config.fast_txt or args.fast_txt
+    patch_config.verify_txt = patch_config.verify_txt or args.verify_txt
     
     if patch_config.use_colmap_points:
-        print(f"Point cloud:     COLMAP points3D.bin (from sparse reconstruction)")
+        point_cloud = "COLMAP points3D.bin (from sparse reconstruction)"
     elif patch_config.pointcloud_path:
-        print(f"Point cloud:     {patch_config.pointcloud_path} (dense PLY)")
-        print(f"Sample %:        {patch_config.sample_percentage}%")
+        point_cloud = (f"{patch_config.pointcloud_path} (dense PLY)\n"
+                       f"Sample %:        {patch_config.sample_percentage}%")
     else:
-        print(f"Point cloud:     None (will train with random initialization)")
-    
-    print(f"Output:          {patch_config.output_path}")
-    print(f"Max cameras:     {patch_config.max_cameras}")
-    print(f"Buffer:          {patch_config.buffer_meters}m (overlap between patches)")
+        point_cloud = "None (will train with random initialization)"
+    
+    # Header as one write, so it isn't interleaved when several runs share a log
+    print(f"""{'=' * 70}
+COLMAP Patching Workflow
+{'=' * 70}
+Input sparse:    {patch_config.sparse_path}
+Input images:    {patch_config.images_path}
+Point cloud:     {point_cloud}
+Output:          {patch_config.output_path}
+Max cameras:     {patch_config.max_cameras}
+Buffer:          {patch_config.buffer_meters}m (overlap between patches)""")
     
     # Ensure output directory exists
     patch_config.output_path.mkdir(parents=True, exist_ok=True)
     
     # Run workflow steps
     patches_list, min_z, max_z = step1_create_patches(patch_config)
-    step2_split_cameras(patch_config, patches_list, min_z, max_z)
-    step3_split_pointcloud(patch_config, patches_list, min_z, max_z)
+    
+    # Output sparse/0 dir of every patch, built once, created up front and shared by all steps
+    patch_sparse_dirs = [patch_config.output_path / f"p{i}" / "sparse" / "0" for i in range(len(patches_list))]
+    for sparse_dir in patch_sparse_dirs:
+        sparse_dir.mkdir(parents=True, exist_ok=True)
+    
+    # One process pool for the per-patch .txt exports of both steps, only started when exporting
+    num_workers = max(1, min(os.cpu_count(), len(patches_list)))
+    with ProcessPoolExecutor(num_workers) if patch_config.export_txt else nullcontext() as pool:
+        step2_split_cameras(patch_config, patches_list, min_z, max_z, patch_sparse_dirs, pool)
+        step3_split_pointcloud(patch_config, patches_list, min_z, max_z, patch_sparse_dirs, pool)
     
     print_summary(patch_config, patches_list)
     
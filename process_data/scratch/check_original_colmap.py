@@ -3,9 +3,10 @@
 
 import pycolmap
 from pathlib import Path
-from PIL import Image
 from collections import Counter
 
+from match_img_dims import _fast_dims  # header-only (width, height) read, shared with the resize script
+
 sparse_dir = Path("/home/ben/encode/data/intermediate_data/colmap5/sparse")
 images_dir = Path("/home/ben/encode/data/intermediate_data/colmap5/images")
 
@@ -30,19 +31,18 @@ print("\nChecking actual image dimensions...")
 for img_id, image in list(reconstruction.images.items())[:10]:  # Sample first 10
     img_path = images_dir / image.name
     if img_path.exists():
-        with Image.open(img_path) as img:
-            actual_dims = img.size
-            camera = reconstruction.cameras[image.camera_id]
-            expected = (camera.width, camera.height)
-            
-            folder = image.name.split('/')[0]
-            if folder == 'left':
-                left_dims.append(actual_dims)
-            else:
-                right_dims.append(actual_dims)
-            
-            match = "✓" if actual_dims == expected else "❌"
-            print(f"  {match} {image.name}: expected {expected}, actual {actual_dims}")
+        actual_dims = _fast_dims(img_path)
+        camera = reconstruction.cameras[image.camera_id]
+        expected = (camera.width, camera.height)
+        
+        folder = image.name.split('/')[0]
+        if folder == 'left':
+            left_dims.append(actual_dims)
+        else:
+            right_dims.append(actual_dims)
+        
+        match = "✓" if actual_dims == expected else "❌"
+        print(f"  {match} {image.name}: expected {expected}, actual {actual_dims}")
 
 # Sample more images to get full picture
 print("\nSampling 100 images from each camera...")
@@ -56,11 +56,9 @@ for img_id, image in reconstruction.images.items():
     
     folder = image.name.split('/')[0]
     if folder == 'left' and len(left_sample) < 100:
-        with Image.open(img_path) as img:
-            left_sample.append(img.size)
+        left_sample.append(_fast_dims(img_path))
     elif folder == 'right' and len(right_sample) < 100:
-        with Image.open(img_path) as img:
-            right_sample.append(img.size)
+        right_sample.append(_fast_dims(img_path))
     
     if len(left_sample) >= 100 and len(right_sample) >= 100:
         break
@@ -3,11 +3,16 @@
 Compare successful vs failed patches to find patterns.
 """
 
+import struct
 from pathlib import Path
-import pycolmap
 
 patches_dir = Path("/home/ben/encode/data/intermediate_data/colmap5/sparse_patches")
 
+# COLMAP camera model id -> number of params (to step over them in cameras.bin)
+CAMERA_NUM_PARAMS = {0: 3, 1: 4, 2: 4, 3: 5, 4: 8, 5: 8, 6: 12, 7: 5, 8: 4, 9: 5, 10: 12}
+# cameras.bin record header: camera_id, model_id, width, height
+CAMERA_RECORD = struct.Struct("<iiQQ")
+
 # Known from log
 successful = ["p0", "p1", "p2", "p3", "p4", "p7", "p9", "p11", "p13"]
 failed = ["p5", "p6", "p8", "p10", "p12"]
@@ -16,19 +21,39 @@ print("="*70)
 print("Comparing Successful vs Failed Patches")
 print("="*70)
 
+def bin_count(path):
+    """Read the leading uint64 record count of a COLMAP .bin file."""
+    with open(path, 'rb') as f:
+        return struct.unpack('<Q', f.read(8))[0]
+
+
+def read_camera_dims(path):
+    """Read {camera_id: (width, height)} from cameras.bin."""
+    data = path.read_bytes()
+    offset = 8
+    cameras = {}
+    for _ in range(struct.unpack_from('<Q', data, 0)[0]):
+        cam_id, model_id, width, height = CAMERA_RECORD.unpack_from(data, offset)
+        offset += CAMERA_RECORD.size + 8 * CAMERA_NUM_PARAMS[model_id]
+        cameras[cam_id] = (width, height)
+    return cameras
+
+
 def analyze_patch(patch_name):
+    # Only counts and camera sizes are needed, so read them from the .bin headers
+    # rather than building a full pycolmap Reconstruction per patch
     sparse_dir = patches_dir / patch_name / "sparse" / "0"
     if not sparse_dir.exists():
         return None
     
-    recon = pycolmap.Reconstruction(str(sparse_dir))
+    cameras = read_camera_dims(sparse_dir / "cameras.bin")
     
     return {
         "name": patch_name,
-        "num_images": len(recon.images),
-        "num_cameras": len(recon.cameras),
-        "num_points": len(recon.points3D),
-        "cameras": {cam_id: (cam.width, cam.height) for cam_id, cam in recon.cameras.items()}
+        "num_images": bin_count(sparse_dir / "images.bin"),
+        "num_cameras": len(cameras),
+        "num_points": bin_count(sparse_dir / "points3D.bin"),
+        "cameras": cameras
     }
 
 print("\nSUCCESSFUL PATCHES:")
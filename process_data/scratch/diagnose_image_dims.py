@@ -4,15 +4,29 @@ Diagnostic script to check image dimensions across all patches.
 Compares COLMAP expected dimensions with actual image files.
 """
 
+import argparse
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from PIL import Image
 import pycolmap
 from collections import defaultdict
 import json
 
-def check_patch_images(patch_dir, images_base_dir):
-    """Check all images referenced in a patch's COLMAP reconstruction."""
+from match_img_dims import _fast_dims  # header-only (width, height) read, shared with the resize script
+
+NUM_WORKERS = os.cpu_count()  # Patch checks run in parallel (one reconstruction + header reads each)
+
+SAMPLE_PER_CAMERA = 0  # Images read per camera before the rest are trusted (0 = read all)
+
+
+def check_patch_images(patch_dir, images_base_dir, sample_per_camera=SAMPLE_PER_CAMERA):
+    """
+    Check all images referenced in a patch's COLMAP reconstruction.
+    
+    sample_per_camera=0 reads the size of every image instead of sampling.
+    """
     sparse_dir = patch_dir / "sparse" / "0"
     
     if not sparse_dir.exists():
@@ -29,6 +43,8 @@ def check_patch_images(patch_dir, images_base_dir):
         "total_images": len(reconstruction.images),
         "cameras": {},
         "mismatches": [],
+        "sampled_cameras": [],  # cameras trusted after their sample matched
+        "images_read": 0,  # images whose dimensions were actually read
         "unique_dimensions": set()
     }
     
@@ -40,32 +56,46 @@ def check_patch_images(patch_dir, images_base_dir):
             "expected_height": camera.height
         }
     
-    # Check each image
+    # Check images camera by camera. Once the first sample_per_camera readable images
+    # of a camera all match, its remaining images are trusted (existence is still checked);
+    # any mismatch or read error in the sample means every image of that camera is read.
+    images_by_camera = defaultdict(list)
+    for image in reconstruction.images.values():
+        images_by_camera[image.camera_id].append(image)
+    
     mismatch_count = 0
-    for img_id, image in reconstruction.images.items():
+    for camera_id, images in images_by_camera.items():
         # Get expected dimensions from camera
-        camera = reconstruction.cameras[image.camera_id]
+        camera = reconstruction.cameras[camera_id]
         expected_dims = (camera.width, camera.height)
+        sampled = 0
+        sample_ok = True
         
-        # Get actual image file
-        img_path = images_base_dir / image.name
-        
-        if not img_path.exists():
-            results["mismatches"].append({
-                "image_name": image.name,
-                "camera_id": image.camera_id,
-                "error": "File not found"
-            })
-            continue
-        
-        # Check actual dimensions
-        try:
-            with Image.open(img_path) as img:
-                actual_dims = img.size  # (width, height)
+        for image in images:
+            # Get actual image file
+            img_path = images_base_dir / image.name
+            
+            if not img_path.exists():
+                results["mismatches"].append({
+                    "image_name": image.name,
+                    "camera_id": image.camera_id,
+                    "error": "File not found"
+                })
+                continue
+            
+            if sample_per_camera and sample_ok and sampled >= sample_per_camera:
+                continue
+            sampled += 1
+            results["images_read"] += 1
+            
+            # Check actual dimensions
+            try:
+                actual_dims = _fast_dims(img_path)  # (width, height), header bytes only
                 results["unique_dimensions"].add(actual_dims)
                 
                 if actual_dims != expected_dims:
                     mismatch_count += 1
+                    sample_ok = False
                     results["mismatches"].append({
                         "image_name": image.name,
                         "camera_id": image.camera_id,
@@ -74,12 +104,16 @@ def check_patch_images(patch_dir, images_base_dir):
                         "diff": (actual_dims[0] - expected_dims[0], 
                                 actual_dims[1] - expected_dims[1])
                     })
-        except Exception as e:
-            results["mismatches"].append({
-                "image_name": image.name,
-                "camera_id": image.camera_id,
-                "error": f"Failed to read image: {e}"
-            })
+            except Exception as e:
+                sample_ok = False
+                results["mismatches"].append({
+                    "image_name": image.name,
+                    "camera_id": image.camera_id,
+                    "error": f"Failed to read image: {e}"
+                })
+        
+        if sample_per_camera and sample_ok and sampled < len(images):
+            results["sampled_cameras"].append(camera_id)
     
     results["mismatch_count"] = mismatch_count
     results["unique_dimensions"] = list(results["unique_dimensions"])
@@ -88,6 +122,12 @@ def check_patch_images(patch_dir, images_base_dir):
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Check image dimensions across all patches")
+    parser.add_argument('--sample-per-camera', type=int, default=SAMPLE_PER_CAMERA,
+                        help=f'Images to read per camera before trusting the rest '
+                             f'(default: {SAMPLE_PER_CAMERA}, 0 = read every image)')
+    args = parser.parse_args()
+    
     patches_dir = Path("/home/ben/encode/data/intermediate_data/colmap5/sparse_patches")
     images_dir = Path("/home/ben/encode/data/intermediate_data/colmap5/images")
     
@@ -96,6 +136,8 @@ def main():
     print("="*70)
     print(f"Patches directory: {patches_dir}")
     print(f"Images directory:  {images_dir}")
+    if args.sample_per_camera:
+        print(f"Sampling:          {args.sample_per_camera} images per camera (0 = read all)")
     print()
     
     # Find all patch directories
@@ -109,27 +151,32 @@ def main():
     failed_patches = []
     total_mismatches = 0
     
-    for patch_dir in patch_dirs:
-        print(f"Checking {patch_dir.name}...", end=" ", flush=True)
-        
-        results = check_patch_images(patch_dir, images_dir)
-        
-        if results is None:
-            print("SKIPPED (no sparse/0)")
-            continue
-        
-        if "error" in results:
-            print(f"ERROR: {results['error']}")
-            continue
-        
-        all_results.append(results)
-        
-        if results["mismatch_count"] > 0:
-            failed_patches.append(patch_dir.name)
-            total_mismatches += results["mismatch_count"]
-            print(f"❌ {results['mismatch_count']} mismatches")
-        else:
-            print("✓ All match")
+    # Each worker loads its own reconstruction and returns plain dicts; map keeps patch order
+    with ProcessPoolExecutor(max_workers=NUM_WORKERS) as ex:
+        for patch_dir, results in zip(patch_dirs, ex.map(check_patch_images, patch_dirs, repeat(images_dir),
+                                                              repeat(args.sample_per_camera))):
+            print(f"Checking {patch_dir.name}...", end=" ", flush=True)
+            
+            if results is None:
+                print("SKIPPED (no sparse/0)")
+                continue
+            
+            if "error" in results:
+                print(f"ERROR: {results['error']}")
+                continue
+            
+            all_results.append(results)
+            
+            if results["mismatch_count"] > 0:
+                failed_patches.append(patch_dir.name)
+                total_mismatches += results["mismatch_count"]
+                print(f"❌ {results['mismatch_count']} mismatches")
+            else:
+                if results["sampled_cameras"]:
+                    # Partial check: never report it as a full pass
+                    print(f"✓ sampled {results['images_read']}/{results['total_images']}, no mismatches")
+                else:
+                    print("✓ All match")
     
     print()
     print("="*70)
@@ -173,6 +220,8 @@ def main():
             
             if len(result["mismatches"]) > 5:
                 print(f"    ... and {len(result['mismatches']) - 5} more")
+    elif any(r["sampled_cameras"] for r in all_results):
+        print("✓ No mismatches in the sampled images (rerun with --sample-per-camera 0 for a full check)")
     else:
         print("✓ All patches have matching dimensions!")
     
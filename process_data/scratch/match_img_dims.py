@@ -10,42 +10,128 @@ This fixes tensor dimension mismatch errors in LFS during splatting.
 #TODO: in future, just do resizing before running colmap to prevent this messy issue.
 """
 
+import argparse
+import os
 import shutil
+import struct
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from PIL import Image
-import pycolmap
-import numpy as np
+
+# NOTE: PIL, pyvips, cv2, numpy and pycolmap are imported inside the functions that use
+# them, so the "nothing to do" path doesn't pay for loading them
 
 
 # CONFIGURATION
 IMAGES_DIR = Path("/home/ben/encode/data/intermediate_data/colmap5/images")
 PATCHES_DIR = Path("/home/ben/encode/data/intermediate_data/colmap5/sparse_patches")
+NUM_WORKERS = os.cpu_count()  # Resize processes (decode + resample is CPU-bound)
+# Files rewritten when cameras are updated (copied, not hardlinked, in the backup)
+REWRITTEN_FILES = {"cameras.bin", "cameras.txt"}
+# Resize backends: pil (LANCZOS, default and reproducible), cv2 (INTER_AREA), pyvips (thumbnail)
+RESIZE_BACKENDS = ("pil", "cv2", "pyvips")
+
+# COLMAP camera model ID -> (name, number of params)
+CAMERA_MODELS = {
+    0: ("SIMPLE_PINHOLE", 3),
+    1: ("PINHOLE", 4),
+    2: ("SIMPLE_RADIAL", 4),
+    3: ("RADIAL", 5),
+    4: ("OPENCV", 8),
+    5: ("OPENCV_FISHEYE", 8),
+    6: ("FULL_OPENCV", 12),
+    7: ("FOV", 5),
+    8: ("SIMPLE_RADIAL_FISHEYE", 4),
+    9: ("RADIAL_FISHEYE", 5),
+    10: ("THIN_PRISM_FISHEYE", 12),
+}
+# cameras.bin record header: camera_id, model_id, width, height (params follow as doubles)
+CAMERA_RECORD = struct.Struct("<iiQQ")
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# JPEG start-of-frame markers (SOF0-SOF15, excluding DHT, JPG and DAC)
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7,
+                    0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
 
 
 # IMPLEMENTATION
+def _fast_dims(path: Path) -> tuple[int, int]:
+    """
+    Return (width, height) from the PNG IHDR chunk or JPEG SOF marker, reading
+    only the header bytes. Falls back to PIL for anything else.
+    """
+    with open(path, 'rb') as f:
+        head = f.read(24)
+        if head.startswith(PNG_SIGNATURE) and head[12:16] == b'IHDR':
+            return struct.unpack('>II', head[16:24])
+        if head.startswith(b'\xff\xd8'):
+            f.seek(2)
+            while True:
+                marker = f.read(2)
+                if len(marker) < 2 or marker[0] != 0xFF:
+                    break
+                if marker[1] == 0xFF:  # fill byte, re-sync on the next one
+                    f.seek(-1, os.SEEK_CUR)
+                    continue
+                segment_len = struct.unpack('>H', f.read(2))[0]
+                if marker[1] in JPEG_SOF_MARKERS:
+                    height, width = struct.unpack('>xHH', f.read(5))
+                    return width, height
+                f.seek(segment_len - 2, os.SEEK_CUR)
+    
+    from PIL import Image
+    with Image.open(path) as img:
+        return img.size
+
+
+def _link_or_copy(src: str, dst: str):
+    """
+    copytree copy_function: real copy for files the camera update rewrites,
+    hardlink for everything else (falls back to a copy across filesystems).
+    """
+    # These are rewritten in place (truncating the same inode), so a hardlinked
+    # backup would be overwritten too
+    if os.path.basename(src) in REWRITTEN_FILES:
+        return shutil.copy2(src, dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+    return dst
+
+
+def _selective_backup(src: Path, dst: Path):
+    """Back up a patches tree, only copying the data of files that will be modified."""
+    shutil.copytree(src, dst, copy_function=_link_or_copy)
+
+
+def _probe_subfolder(subfolder: Path):
+    """Return (width, height) of the first PNG (else JPG) in subfolder, or None."""
+    # Find first image in this subfolder
+    for img_path in subfolder.glob("*.[pP][nN][gG]"):
+        return _fast_dims(img_path)  # (width, height)
+    
+    # Also try jpg
+    for img_path in subfolder.glob("*.[jJ][pP][gG]"):
+        return _fast_dims(img_path)
+    
+    return None
+
+
 def get_all_image_dimensions(images_dir: Path) -> dict[str, tuple[int, int]]:
     """
     Scan all images and return {subfolder: (width, height)} for each camera.
+    
+    Subfolders are probed concurrently, so per-file open latency (e.g. on network
+    mounts) overlaps instead of adding up.
     """
-    dims = {}
-    for subfolder in sorted(images_dir.iterdir()):
-        if not subfolder.is_dir():
-            continue
-        
-        # Find first image in this subfolder
-        for img_path in subfolder.glob("*.[pP][nN][gG]"):
-            with Image.open(img_path) as img:
-                dims[subfolder.name] = img.size  # (width, height)
-            break
-        
-        # Also try jpg
-        if subfolder.name not in dims:
-            for img_path in subfolder.glob("*.[jJ][pP][gG]"):
-                with Image.open(img_path) as img:
-                    dims[subfolder.name] = img.size
-                break
+    subfolders = [d for d in sorted(images_dir.iterdir()) if d.is_dir()]
+    if not subfolders:
+        return {}
     
-    return dims
+    with ThreadPoolExecutor(max_workers=len(subfolders)) as ex:
+        sizes = ex.map(_probe_subfolder, subfolders)
+        return {d.name: size for d, size in zip(subfolders, sizes) if size is not None}
 
 
 def compute_target_dimensions(dims: dict[str, tuple[int, int]]) -> tuple[int, int]:
@@ -57,9 +143,102 @@ def compute_target_dimensions(dims: dict[str, tuple[int, int]]) -> tuple[int, in
     return (min(widths), min(heights))
 
 
-def resize_images(images_dir: Path, backup_dir: Path, target_size: tuple[int, int]):
+@lru_cache(maxsize=None)
+def _resize_backend(name: str):
+    """
+    Import the library for a resize backend, once per process (cached, as
+    _resize_one runs per image). The backend is chosen explicitly with
+    --resize-backend, so the output pixels never depend on what happens to be installed.
+    """
+    if name == "pyvips":
+        import pyvips  # Streaming decode -> resample -> encode, shrink-on-load for JPEG
+        return pyvips
+    if name == "cv2":
+        import cv2
+        cv2.setNumThreads(1)  # Parallelism comes from the process pool
+        return cv2
+    from PIL import Image
+    return Image
+
+
+def _resize_one(task: tuple[Path, Path, int, int, str]):
+    """Resize a single image (top-level so it can be pickled for the process pool)."""
+    img_path, output_path, target_w, target_h, backend = task
+    lib = _resize_backend(backend)
+    
+    if backend == "pyvips":
+        # size=FORCE: exact target size, aspect ratio not preserved (same as PIL resize below).
+        # no_rotate: thumbnail applies EXIF orientation by default, but target sizes and
+        # COLMAP cameras use the raw pixel layout (as the cv2/PIL branches do)
+        lib.Image.thumbnail(
+            str(img_path), target_w, height=target_h, size=lib.enums.Size.FORCE, no_rotate=True
+        ).write_to_file(str(output_path))
+    elif backend == "cv2":
+        # Target is the min width/height, so this is always a downscale: INTER_AREA is
+        # the alias-free choice, and cv2's SIMD kernels are faster than PIL LANCZOS
+        img = lib.imread(str(img_path), lib.IMREAD_UNCHANGED)
+        if img is None:
+            raise IOError(f"Could not read image: {img_path}")
+        resized = lib.resize(img, (target_w, target_h), interpolation=lib.INTER_AREA)
+        params = [lib.IMWRITE_PNG_COMPRESSION, 3] if output_path.suffix.lower() == ".png" else []
+        if not lib.imwrite(str(output_path), resized, params):
+            raise IOError(f"Could not write image: {output_path}")
+    else:
+        with lib.open(img_path) as img:
+            img.resize((target_w, target_h), lib.LANCZOS).save(output_path)
+
+
+def check_backends() -> bool:
+    """
+    Resize an EXIF orientation-6 JPEG with every installed backend and check each
+    output matches PIL's: same size and the same raw (unrotated) pixel layout.
+    Returns True if all installed backends agree.
+    """
+    import tempfile
+    import numpy as np
+    from PIL import Image
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        # Left half white, right half black: a rotated output can't match
+        pixels = np.zeros((60, 80, 3), dtype=np.uint8)
+        pixels[:, :40] = 255
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Orientation: rotate 90 CW to display
+        src = Path(tmp) / "orientation6.jpg"
+        Image.fromarray(pixels).save(src, exif=exif, quality=95)
+        
+        outputs = {}
+        for backend in RESIZE_BACKENDS:
+            try:
+                _resize_backend(backend)
+            except ImportError:
+                print(f"  - {backend}: not installed, skipped")
+                continue
+            # PNG output so the comparison isn't affected by JPEG re-encoding
+            out = Path(tmp) / f"{backend}.png"
+            _resize_one((src, out, 40, 30, backend))
+            with Image.open(out) as img:
+                outputs[backend] = np.asarray(img.convert("RGB"), dtype=np.int16)
+    
+    reference = outputs["pil"]
+    all_ok = True
+    for backend, result in outputs.items():
+        # Resampling kernels differ, so compare with a tolerance (a rotation gives ~128)
+        ok = result.shape == reference.shape and np.abs(result - reference).mean() < 8
+        all_ok &= ok
+        print(f"  {'✓' if ok else '❌'} {backend}: {result.shape[1]}×{result.shape[0]}")
+    return all_ok
+
+
+def resize_images(images_dir: Path, backup_dir: Path, target_size: tuple[int, int],
+                  backend: str = "pil"):
     """
-    Resize all images to target_size. Backs up original directory first.
+    Resize all images to target_size with the given backend (see RESIZE_BACKENDS).
+    
+    Resized images are written to a sibling staging dir (<images>_resized) while
+    the originals stay in place. Only when every image is done are the two dirs
+    swapped with renames (originals -> backup_dir, staging -> images_dir), so an
+    interrupted run leaves images_dir untouched.
     """
     if backup_dir.exists():
         print(f"⚠️  Backup already exists: {backup_dir}")
@@ -69,137 +248,202 @@ def resize_images(images_dir: Path, backup_dir: Path, target_size: tuple[int, in
             exit(1)
         shutil.rmtree(backup_dir)
     
-    # Backup original
-    print(f"Backing up: {images_dir} → {backup_dir}")
-    shutil.copytree(images_dir, backup_dir)
-    
-    # Remove original and recreate
-    shutil.rmtree(images_dir)
-    images_dir.mkdir(parents=True)
+    staging_dir = images_dir.with_name(images_dir.name + "_resized")
+    if staging_dir.exists():
+        print(f"Removing leftover staging dir from an interrupted run: {staging_dir}")
+        shutil.rmtree(staging_dir)
+    staging_dir.mkdir(parents=True)
     
     target_w, target_h = target_size
     
-    # Resize all images
-    for subfolder in sorted(backup_dir.iterdir()):
-        if not subfolder.is_dir():
-            continue
-        
-        output_folder = images_dir / subfolder.name
-        output_folder.mkdir(parents=True, exist_ok=True)
-        
-        img_files = list(subfolder.glob("*.[pP][nN][gG]")) + list(subfolder.glob("*.[jJ][pP][gG]"))
-        print(f"\nResizing {len(img_files)} images in {subfolder.name}/ to {target_w}×{target_h}...")
-        
-        for i, img_path in enumerate(img_files, 1):
-            with Image.open(img_path) as img:
-                orig_size = img.size
-                resized = img.resize((target_w, target_h), Image.LANCZOS)
-                
-                output_path = output_folder / img_path.name
-                resized.save(output_path)
+    # Resize all images, one pool shared across camera folders
+    with ProcessPoolExecutor(max_workers=NUM_WORKERS) as ex:
+        for subfolder in sorted(images_dir.iterdir()):
+            if not subfolder.is_dir():
+                continue
             
-            if i % 100 == 0:
-                print(f"  Processed {i}/{len(img_files)}...")
-        
-        print(f"  ✓ Completed {subfolder.name}/")
+            output_folder = staging_dir / subfolder.name
+            output_folder.mkdir(parents=True, exist_ok=True)
+            
+            img_files = list(subfolder.glob("*.[pP][nN][gG]")) + list(subfolder.glob("*.[jJ][pP][gG]"))
+            print(f"\nResizing {len(img_files)} images in {subfolder.name}/ to {target_w}×{target_h}...")
+            
+            tasks = [(img_path, output_folder / img_path.name, target_w, target_h, backend)
+                     for img_path in img_files]
+            for i, _ in enumerate(ex.map(_resize_one, tasks, chunksize=32), 1):
+                if i % 100 == 0:
+                    print(f"  Processed {i}/{len(img_files)}...")
+            
+            print(f"  ✓ Completed {subfolder.name}/")
+    
+    # Swap in the resized images (renames on the same filesystem, no data copied)
+    print(f"\nBacking up: {images_dir} → {backup_dir}")
+    images_dir.rename(backup_dir)
+    staging_dir.rename(images_dir)
+
+
+@lru_cache(maxsize=None)
+def get_param_scales(model_name: str, num_params: int, scale_x: float, scale_y: float):
+    """
+    Per-parameter scale vector for camera.params, or None for unsupported models.
+    Cached, since every patch shares the same cameras and scale factors.
+    """
+    import numpy as np
+    
+    scales = np.ones(num_params)
+    if model_name in ["PINHOLE", "OPENCV"]:
+        # PINHOLE: fx, fy, cx, cy
+        # OPENCV: fx, fy, cx, cy, k1, k2, p1, p2
+        scales[:4] = (scale_x, scale_y, scale_x, scale_y)
+    elif model_name in ["SIMPLE_PINHOLE", "SIMPLE_RADIAL", "RADIAL"]:
+        # SIMPLE_PINHOLE: f, cx, cy
+        # SIMPLE_RADIAL: f, cx, cy, k
+        # RADIAL: f, cx, cy, k1, k2
+        scales[:3] = ((scale_x + scale_y) / 2, scale_x, scale_y)  # Average scale for focal length
+    else:
+        return None
+    scales.flags.writeable = False  # Shared between calls
+    return scales
+
+
+def read_cameras_bin(path: Path) -> dict:
+    """Read COLMAP cameras.bin into {camera_id: {model_id, width, height, params}}."""
+    import numpy as np
+    
+    data = path.read_bytes()
+    num_cameras = struct.unpack_from("<Q", data, 0)[0]
+    offset = 8
+    cameras = {}
+    for _ in range(num_cameras):
+        cam_id, model_id, width, height = CAMERA_RECORD.unpack_from(data, offset)
+        offset += CAMERA_RECORD.size
+        num_params = CAMERA_MODELS[model_id][1]
+        params = np.frombuffer(data, dtype="<f8", count=num_params, offset=offset).copy()
+        offset += 8 * num_params
+        cameras[cam_id] = {"model_id": model_id, "width": width, "height": height, "params": params}
+    return cameras
+
+
+def write_cameras_bin(path: Path, cameras: dict):
+    """Write {camera_id: {model_id, width, height, params}} as COLMAP cameras.bin."""
+    import numpy as np
+    
+    chunks = [struct.pack("<Q", len(cameras))]
+    for cam_id, cam in sorted(cameras.items()):
+        chunks.append(CAMERA_RECORD.pack(cam_id, cam["model_id"], cam["width"], cam["height"]))
+        chunks.append(np.asarray(cam["params"], dtype="<f8").tobytes())
+    path.write_bytes(b"".join(chunks))
+
+
+def write_cameras_txt(path: Path, cameras: dict):
+    """Write {camera_id: {model_id, width, height, params}} as COLMAP cameras.txt."""
+    lines = [
+        "# Camera list with one line of data per camera:",
+        "#   CAMERA_ID, MODEL, WIDTH, HEIGHT, PARAMS[]",
+        f"# Number of cameras: {len(cameras)}",
+    ]
+    for cam_id, cam in sorted(cameras.items()):
+        params_str = " ".join(repr(float(p)) for p in cam["params"])
+        lines.append(f"{cam_id} {CAMERA_MODELS[cam['model_id']][0]} {cam['width']} {cam['height']} {params_str}")
+    path.write_text("\n".join(lines) + "\n")
 
 
 def update_cameras_for_patch(patch_dir: Path, scale_factors: dict[int, tuple[float, float]]):
     """
-    Update cameras.bin and cameras.txt with rescaled intrinsics.
+    Update cameras.bin (and cameras.txt, if present) with rescaled intrinsics.
+    
+    Only the camera files are read and rewritten; images and points3D are left
+    alone since a camera update doesn't change them.
     
     Args:
         patch_dir: Path to sparse/0 directory containing cameras.bin
         scale_factors: {camera_id: (scale_x, scale_y)}
+    
+    Returns the report text instead of printing it, so patches updated in
+    parallel don't interleave their output.
     """
+    lines = []
+    log = lines.append
+    
     cameras_bin = patch_dir / "cameras.bin"
     cameras_txt = patch_dir / "cameras.txt"
     
     if not cameras_bin.exists():
-        print(f"  ⚠️  No cameras.bin found in {patch_dir}")
-        return
+        log(f"  ⚠️  No cameras.bin found in {patch_dir}")
+        return "\n".join(lines)
     
-    # Read reconstruction
-    reconstruction = pycolmap.Reconstruction(str(patch_dir))
+    # Read cameras
+    cameras = read_cameras_bin(cameras_bin)
     
-    print(f"\n  Updating cameras in {patch_dir.parent.parent.name}:")
+    log(f"\n  Updating cameras in {patch_dir.parent.parent.name}:")
     
     # Update each camera
-    for cam_id, camera in reconstruction.cameras.items():
+    for cam_id, camera in cameras.items():
         if cam_id not in scale_factors:
-            print(f"    ⚠️  Camera {cam_id} not in scale_factors, skipping")
+            log(f"    ⚠️  Camera {cam_id} not in scale_factors, skipping")
             continue
         
         scale_x, scale_y = scale_factors[cam_id]
         
         # Store original
-        orig_width = camera.width
-        orig_height = camera.height
-        orig_params = camera.params.copy()
+        orig_width = camera["width"]
+        orig_height = camera["height"]
+        orig_params = camera["params"]
         
         # Update dimensions
         new_width = int(orig_width * scale_x)
         new_height = int(orig_height * scale_y)
         
-        # Rescale intrinsics
-        model_name = camera.model.name
-        
-        if model_name == "PINHOLE":
-            # PINHOLE: fx, fy, cx, cy
-            fx, fy, cx, cy = camera.params
-            new_params = np.array([
-                fx * scale_x,
-                fy * scale_y,
-                cx * scale_x,
-                cy * scale_y
-            ])
-        elif model_name in ["SIMPLE_PINHOLE", "SIMPLE_RADIAL"]:
-            # SIMPLE_PINHOLE: f, cx, cy
-            # SIMPLE_RADIAL: f, cx, cy, k
-            f, cx, cy = camera.params[:3]
-            new_params = camera.params.copy()
-            new_params[0] = f * (scale_x + scale_y) / 2  # Average scale for focal length
-            new_params[1] = cx * scale_x
-            new_params[2] = cy * scale_y
-        elif model_name in ["RADIAL", "OPENCV"]:
-            # OPENCV: fx, fy, cx, cy, k1, k2, p1, p2
-            fx, fy, cx, cy = camera.params[:4]
-            new_params = camera.params.copy()
-            new_params[0] = fx * scale_x
-            new_params[1] = fy * scale_y
-            new_params[2] = cx * scale_x
-            new_params[3] = cy * scale_y
-            # Distortion params (k1, k2, p1, p2, ...) remain unchanged
-        else:
-            print(f"    ⚠️  Unknown camera model: {model_name}, skipping")
+        # Rescale intrinsics (one element-wise multiply, distortion params unchanged)
+        model_name = CAMERA_MODELS[camera["model_id"]][0]
+        param_scales = get_param_scales(model_name, len(orig_params), scale_x, scale_y)
+        if param_scales is None:
+            log(f"    ⚠️  Unknown camera model: {model_name}, skipping")
             continue
+        new_params = orig_params * param_scales
         
         # Update camera
-        camera.width = new_width
-        camera.height = new_height
-        camera.params = new_params
+        camera["width"] = new_width
+        camera["height"] = new_height
+        camera["params"] = new_params
         
         # Print changes
-        print(f"    Camera {cam_id} ({model_name}):")
-        print(f"      Dimensions: {orig_width}×{orig_height} → {new_width}×{new_height}")
-        print(f"      Scale: x={scale_x:.6f}, y={scale_y:.6f}")
+        log(f"    Camera {cam_id} ({model_name}):")
+        log(f"      Dimensions: {orig_width}×{orig_height} → {new_width}×{new_height}")
+        log(f"      Scale: x={scale_x:.6f}, y={scale_y:.6f}")
         if model_name == "PINHOLE":
-            print(f"      fx: {orig_params[0]:.2f} → {new_params[0]:.2f}")
-            print(f"      fy: {orig_params[1]:.2f} → {new_params[1]:.2f}")
-            print(f"      cx: {orig_params[2]:.2f} → {new_params[2]:.2f}")
-            print(f"      cy: {orig_params[3]:.2f} → {new_params[3]:.2f}")
+            log(f"      fx: {orig_params[0]:.2f} → {new_params[0]:.2f}")
+            log(f"      fy: {orig_params[1]:.2f} → {new_params[1]:.2f}")
+            log(f"      cx: {orig_params[2]:.2f} → {new_params[2]:.2f}")
+            log(f"      cy: {orig_params[3]:.2f} → {new_params[3]:.2f}")
     
-    # Write updated reconstruction
-    reconstruction.write_binary(str(patch_dir))
-    reconstruction.write_text(str(patch_dir))
+    # Write updated cameras (keep cameras.txt in sync if the patch has one)
+    write_cameras_bin(cameras_bin, cameras)
+    if cameras_txt.exists():
+        write_cameras_txt(cameras_txt, cameras)
     
-    print(f"  ✓ Updated {patch_dir.parent.parent.name}")
+    log(f"  ✓ Updated {patch_dir.parent.parent.name}")
+    return "\n".join(lines)
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Resize images to consistent dimensions and update COLMAP intrinsics")
+    parser.add_argument('--resize-backend', choices=RESIZE_BACKENDS, default="pil",
+                        help='Image resize backend: pil = LANCZOS (default, reproducible), '
+                             'cv2 = INTER_AREA (faster), pyvips = thumbnail (fastest, needs pyvips)')
+    parser.add_argument('--check-backends', action='store_true',
+                        help='Only check that every installed backend resizes an EXIF-rotated JPEG '
+                             'the same way as PIL, then exit')
+    args = parser.parse_args()
+    
+    if args.check_backends:
+        print("Checking resize backends on an EXIF orientation-6 JPEG...")
+        return 0 if check_backends() else 1
+    
     print("="*70)
     print("Image Dimension Matcher - COLMAP Intrinsics Updater")
     print("="*70)
+    print(f"Resize backend: {args.resize_backend}")
     
     # 1. Analyze current image dimensions
     print("\n[1/4] Analyzing image dimensions...")
@@ -260,7 +504,8 @@ def main():
         
         # 3. Resize images
         print(f"\n[3/4] Resizing images...")
-        resize_images(IMAGES_DIR, backup_images, (target_w, target_h))
+        _resize_backend(args.resize_backend)  # Fail on a missing backend before any work starts
+        resize_images(IMAGES_DIR, backup_images, (target_w, target_h), args.resize_backend)
     else:
         # Get scale factors from backup
         print(f"\n[2-3/4] Computing scale factors from backup...")
@@ -280,6 +525,7 @@ def main():
     print(f"\n[4/4] Updating camera intrinsics in patches...")
     
     # First, determine camera_id → folder mapping from any patch
+    import pycolmap
     sample_patch = sorted(PATCHES_DIR.glob("p*/sparse/0"))[0]
     reconstruction = pycolmap.Reconstruction(str(sample_patch))
     
@@ -315,14 +561,16 @@ def main():
         shutil.rmtree(backup_patches)
     
     print(f"\nBacking up: {PATCHES_DIR} → {backup_patches}")
-    shutil.copytree(PATCHES_DIR, backup_patches)
+    _selective_backup(PATCHES_DIR, backup_patches)
     
     # Update all patches
     patch_dirs = sorted(PATCHES_DIR.glob("p*/sparse/0"))
     print(f"\nUpdating {len(patch_dirs)} patches...")
     
-    for patch_dir in patch_dirs:
-        update_cameras_for_patch(patch_dir, cam_scale_factors)
+    # Patches are independent, so overlap their reads/writes
+    with ThreadPoolExecutor(max_workers=max(1, min(16, len(patch_dirs)))) as ex:
+        for report in ex.map(lambda p: update_cameras_for_patch(p, cam_scale_factors), patch_dirs):
+            print(report)
     
     print("\n" + "="*70)
     print("✓ COMPLETED")
@@ -339,4 +587,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    exit(main())